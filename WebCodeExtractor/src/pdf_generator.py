@@ -2,8 +2,160 @@
 Module to generate PDF reports of extracted website content.
 """
 
+import io
 import os
+import codecs
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from fpdf import FPDF
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+READ_WORKERS = 8
+READ_BUFFER_SIZE = 131072
+# Chunk size used when writing the finished PDF to disk
+WRITE_CHUNK_SIZE = 1 << 20
+# Characters of each file shown in the report before it is truncated
+MAX_CONTENT_LENGTH = 5000
+# Bytes inspected to decide whether a file is text before decoding it
+BINARY_PROBE_SIZE = 512
+# Control bytes that legitimately appear in text files (\b \t \n \f \r ESC)
+_TEXT_CONTROL_BYTES = frozenset((8, 9, 10, 12, 13, 27))
+# Report sections in order: (extracted_files key, chapter title, max files shown)
+REPORT_SECTIONS = (
+    ('html', 'HTML Content', None),
+    ('css', 'CSS Content', None),
+    ('js', 'JavaScript Content', None),
+    ('images', 'Images', 10),
+)
+# Images are drawn 180mm wide, so anything past this many pixels is wasted
+IMAGE_MAX_WIDTH = 600
+IMAGE_JPEG_QUALITY = 75
+
+
+def _latin1_space_replace(error):
+    """Codec error handler that swaps unencodable characters for spaces."""
+    return ' ' * (error.end - error.start), error.end
+
+
+codecs.register_error('latin1_space_replace', _latin1_space_replace)
+
+# Translation table of common Unicode characters to their ASCII equivalents,
+# built once so _sanitize_text doesn't rescan the text per replacement
+_SANITIZE_TABLE = str.maketrans({
+    '\u2013': '-',  # en dash
+    '\u2014': '--',  # em dash
+    '\u2018': "'",  # left single quote
+    '\u2019': "'",  # right single quote
+    '\u201c': '"',  # left double quote
+    '\u201d': '"',  # right double quote
+    '\u2022': '*',  # bullet
+    '\u2026': '...',  # ellipsis
+    '\u21e7': '^',  # upwards white arrow
+    '\u25b2': '^',  # black up-pointing triangle
+    '\u25bc': 'v',  # black down-pointing triangle
+    '\u2192': '->',  # rightwards arrow
+    '\u2190': '<-',  # leftwards arrow
+    '\u00a9': '(c)',  # copyright sign
+    '\u00ae': '(R)',  # registered sign
+    '\u00b0': 'deg',  # degree sign
+    '\u00b1': '+/-',  # plus-minus sign
+})
+
+
+def _looks_binary(header):
+    """Guess from the first bytes of a file whether it is binary."""
+    if b'\x00' in header:
+        return True
+    control = sum(1 for b in header if (b < 32 or b == 127) and b not in _TEXT_CONTROL_BYTES)
+    return control > len(header) * 0.3
+
+
+def _read_text_file(file_path, max_length=MAX_CONTENT_LENGTH):
+    """
+    Read a text file so it can be laid out later.
+
+    Only the first BINARY_PROBE_SIZE bytes are read from files that turn out
+    to be binary, and at most enough bytes for max_length characters from
+    text files.
+
+    Returns:
+        tuple: (content, is_truncated, is_binary, error) where content is None
+            unless the file was read as text
+    """
+    # UTF-8 needs at most 4 bytes per character
+    max_bytes = max_length * 4
+    try:
+        with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            header = f.read(BINARY_PROBE_SIZE)
+            if _looks_binary(header):
+                return None, False, True, None
+            # Read one extra byte to tell whether anything was left behind
+            data = header + f.read(max(0, max_bytes + 1 - len(header)))
+        has_more = len(data) > max_bytes
+        # A non-final decode drops a multibyte character split by the cut
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        content = decoder.decode(data[:max_bytes], final=not has_more)
+        content = content.replace('\r\n', '\n')
+        is_truncated = has_more or len(content) > max_length
+        return content[:max_length], is_truncated, False, None
+    except Exception as e:
+        return None, False, False, e
+
+
+def _file_digest(file_path):
+    """Return a BLAKE2b digest of a file's bytes, or None if it can't be read."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            for chunk in iter(lambda: f.read(READ_BUFFER_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def _write_pdf(data, output_path):
+    """
+    Write the rendered PDF bytes to disk in large sequential chunks.
+
+    Args:
+        data (bytes | bytearray): Rendered PDF document
+        output_path (str): Path where to save the PDF report
+    """
+    view = memoryview(data)
+    with open(output_path, 'wb', buffering=WRITE_CHUNK_SIZE) as f:
+        if hasattr(os, 'posix_fadvise'):
+            # Hint a one-off sequential write so it doesn't crowd the page cache
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_NOREUSE)
+        for start in range(0, len(view), WRITE_CHUNK_SIZE):
+            f.write(view[start:start + WRITE_CHUNK_SIZE])
+
+
+def _prepare_image(file_path):
+    """
+    Decode an image once and re-encode it as a downscaled JPEG.
+
+    Animated images are reduced to their first frame and transparent areas
+    are flattened onto white.
+
+    Returns:
+        bytes: JPEG data ready to wrap in a BytesIO for FPDF.image
+    """
+    with Image.open(file_path) as im:
+        im.thumbnail((IMAGE_MAX_WIDTH, im.height))
+        if im.mode in ('RGBA', 'LA', 'P'):
+            im = im.convert('RGBA')
+            background = Image.new('RGB', im.size, (255, 255, 255))
+            background.paste(im, mask=im.getchannel('A'))
+            im = background
+        buf = io.BytesIO()
+        im.convert('RGB').save(buf, 'JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True)
+    return buf.getvalue()
 
 class WebsiteContentPDF(FPDF):
     """Custom PDF class for website content reports."""
@@ -12,6 +164,7 @@ class WebsiteContentPDF(FPDF):
         super().__init__()
         self.title = "Website Content Report"
         self.set_auto_page_break(auto=True, margin=15)
+        self._body_metrics = None
     
     def header(self):
         # Set up header with title
@@ -31,12 +184,13 @@ class WebsiteContentPDF(FPDF):
         self.cell(0, 10, title, ln=True)
         self.ln(5)
     
-    def chapter_body(self, content, max_length=5000):
+    def chapter_body(self, content, max_length=MAX_CONTENT_LENGTH, truncated=False):
         # Add chapter body text with reasonable truncation
         self.set_font("Arial", "", 10)
         
-        # Truncate very long content to avoid PDF generation issues
-        if len(content) > max_length:
+        # Truncate very long content to avoid PDF generation issues; callers
+        # that already cut the content short pass truncated=True
+        if truncated or len(content) > max_length:
             content = content[:max_length] + "...\n[Content truncated due to length]"
             
         # Replace tabs with spaces for better formatting
@@ -45,83 +199,122 @@ class WebsiteContentPDF(FPDF):
         # Handle Unicode characters by replacing them with ASCII equivalents or removing them
         content = self._sanitize_text(content)
             
-        # Output the text with line breaks preserved
-        self.multi_cell(0, 5, content)
+        # Output the text with line breaks preserved, pre-wrapped to the
+        # line width so fpdf doesn't re-measure every word of long lines
+        for line in content.split("\n"):
+            for wrapped in self._wrap_line(line):
+                self.cell(0, 5, wrapped, ln=True)
         self.ln(5)
     
+    def _wrap_line(self, line):
+        """
+        Split a line of body text into pieces that fit the page width,
+        breaking at the last space like multi_cell does, or mid-word when a
+        word is wider than the line.
+        """
+        widths, max_width = self._get_body_metrics()
+        pieces = []
+        start = 0
+        width = 0.0
+        space = -1  # Index of the last space in the current piece
+        for i, char in enumerate(line):
+            if char == ' ':
+                space = i
+            width += widths.get(char, 0.0)
+            if width > max_width and i > start:
+                if space > start:
+                    pieces.append(line[start:space])
+                    start = space + 1
+                else:
+                    pieces.append(line[start:i])
+                    start = i
+                width = sum(widths.get(c, 0.0) for c in line[start:i + 1])
+                space = -1
+        pieces.append(line[start:])
+        return pieces
+    
+    def _get_body_metrics(self):
+        """
+        Width of every latin-1 character in the body font, and the usable
+        line width, measured once. Core fonts have no kerning, so a line's
+        width is the sum of its characters' widths.
+        """
+        if self._body_metrics is None:
+            widths = {chr(c): self.get_string_width(chr(c)) for c in range(256)}
+            max_width = self.w - self.l_margin - self.r_margin - 2 * self.c_margin
+            self._body_metrics = (widths, max_width)
+        return self._body_metrics
+    
     def _sanitize_text(self, text):
         """Sanitize text to be compatible with FPDF's latin-1 encoding."""
-        # Create a mapping of common Unicode characters to their ASCII equivalents
-        replacements = {
-            '\u2013': '-',  # en dash
-            '\u2014': '--',  # em dash
-            '\u2018': "'",  # left single quote
-            '\u2019': "'",  # right single quote
-            '\u201c': '"',  # left double quote
-            '\u201d': '"',  # right double quote
-            '\u2022': '*',  # bullet
-            '\u2026': '...',  # ellipsis
-            '\u21e7': '^',  # upwards white arrow
-            '\u25b2': '^',  # black up-pointing triangle
-            '\u25bc': 'v',  # black down-pointing triangle
-            '\u2192': '->',  # rightwards arrow
-            '\u2190': '<-',  # leftwards arrow
-            '\u00a9': '(c)',  # copyright sign
-            '\u00ae': '(R)',  # registered sign
-            '\u00b0': 'deg',  # degree sign
-            '\u00b1': '+/-',  # plus-minus sign
-        }
+        # Pure ASCII text needs no changes
+        if text.isascii():
+            return text
         
-        # Replace known problematic characters
-        for unicode_char, replacement in replacements.items():
-            text = text.replace(unicode_char, replacement)
+        # Replace known problematic characters in a single C-level pass
+        text = text.translate(_SANITIZE_TABLE)
         
-        # Remove any remaining non-latin1 characters
-        text = ''.join(c if ord(c) < 256 else ' ' for c in text)
+        # Replace any remaining non-latin1 characters with spaces
+        text = text.encode('latin-1', 'latin1_space_replace').decode('latin-1')
         
         return text
     
-    def add_file_content(self, file_path, title=None):
-        """Add the content of a file to the PDF."""
-        # Skip if file doesn't exist
-        if not os.path.exists(file_path):
-            return False
-            
+    def add_file_content(self, file_path, title=None, prefetched=None):
+        """
+        Add the content of a file to the PDF.
+
+        Args:
+            file_path (str): Path of the file to add
+            title (str, optional): Chapter title, defaults to the file name
+            prefetched (tuple, optional): (content, is_truncated, is_binary, error) result of
+                _read_text_file if the file was already read in the background
+        """
         # Use filename as title if none provided
         if title is None:
             title = os.path.basename(file_path)
         
         try:
             # Read file content
-            is_binary = file_path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp'))
+            is_binary = file_path.lower().endswith(IMAGE_EXTENSIONS)
             
             if is_binary:
                 # For binary image files, add as image
-                self.chapter_title(f"Image: {title}")
                 try:
-                    self.image(file_path, x=10, w=180)
-                    self.ln(5)
+                    image = io.BytesIO(_prepare_image(file_path))
+                except FileNotFoundError:
+                    # Skip if file doesn't exist
+                    return False
                 except Exception as e:
+                    self.chapter_title(f"Image: {title}")
                     self.chapter_body(f"[Could not render image: {str(e)}]")
+                else:
+                    self.chapter_title(f"Image: {title}")
+                    try:
+                        self.image(image, x=10, w=180)
+                        self.ln(5)
+                    except Exception as e:
+                        self.chapter_body(f"[Could not render image: {str(e)}]")
             else:
                 # For text files, add as text
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    self.chapter_title(title)
-                    self.chapter_body(content)
-                except UnicodeDecodeError:
-                    # If we can't decode as text, it might be binary after all
-                    self.chapter_title(title)
+                if prefetched is None:
+                    prefetched = _read_text_file(file_path)
+                content, is_truncated, is_binary, error = prefetched
+                if isinstance(error, FileNotFoundError):
+                    # Skip if file doesn't exist
+                    return False
+                
+                self.chapter_title(title)
+                if is_binary:
+                    # The extension said text but the bytes say otherwise
                     self.chapter_body("[Binary content - not displayed]")
-                except Exception as e:
-                    self.chapter_title(title)
-                    self.chapter_body(f"[Error reading file: {str(e)}]")
+                elif error is not None:
+                    self.chapter_body(f"[Error reading file: {str(error)}]")
+                else:
+                    self.chapter_body(content, truncated=is_truncated)
             
             return True
         except Exception as e:
-            print(f"Error adding file {file_path} to PDF: {str(e)}")
+            logger.error("Error adding file %s to PDF: %s", file_path, e)
             return False
 
 def generate_pdf(extracted_files, output_path):
@@ -136,8 +329,8 @@ def generate_pdf(extracted_files, output_path):
         bool: True if PDF generation was successful, False otherwise
     """
     try:
-        print(f"Starting PDF generation, output path: {output_path}")
-        print(f"Files to include: {extracted_files}")
+        logger.info("Starting PDF generation, output path: %s", output_path)
+        logger.debug("Files to include: %s", extracted_files)
         
         # Create PDF object
         pdf = WebsiteContentPDF()
@@ -147,74 +340,59 @@ def generate_pdf(extracted_files, output_path):
         pdf.add_page()
         pdf.chapter_title("Extraction Summary")
         
-        summary_text = "This report contains the extracted content from the website.\n\n"
-        summary_text += "Files extracted:\n"
+        summary_lines = [
+            "This report contains the extracted content from the website.",
+            "",
+            "Files extracted:",
+        ]
         
         # Add count of files by type
-        for file_type, files in extracted_files.items():
-            if files:
-                summary_text += f"- {file_type.upper()}: {len(files)} files\n"
+        summary_lines += [f"- {file_type.upper()}: {len(files)} files"
+                          for file_type, files in extracted_files.items() if files]
         
-        pdf.chapter_body(summary_text)
+        pdf.chapter_body("\n".join(summary_lines))
         
-        # Add HTML content
-        if extracted_files.get('html'):
-            print(f"Adding HTML content: {len(extracted_files['html'])} files")
-            pdf.add_page()
-            pdf.chapter_title("HTML Content")
-            for html_file in extracted_files['html']:
-                try:
-                    pdf.add_file_content(html_file)
-                except Exception as e:
-                    print(f"Error adding HTML file {html_file}: {str(e)}")
-                    pdf.chapter_body(f"[Error processing file: {str(e)}]")
-        
-        # Add CSS content
-        if extracted_files.get('css'):
-            print(f"Adding CSS content: {len(extracted_files['css'])} files")
-            pdf.add_page()
-            pdf.chapter_title("CSS Content")
-            for css_file in extracted_files['css']:
-                try:
-                    pdf.add_file_content(css_file)
-                except Exception as e:
-                    print(f"Error adding CSS file {css_file}: {str(e)}")
-                    pdf.chapter_body(f"[Error processing file: {str(e)}]")
-        
-        # Add JavaScript content
-        if extracted_files.get('js'):
-            print(f"Adding JavaScript content: {len(extracted_files['js'])} files")
-            pdf.add_page()
-            pdf.chapter_title("JavaScript Content")
-            for js_file in extracted_files['js']:
-                try:
-                    pdf.add_file_content(js_file)
-                except Exception as e:
-                    print(f"Error adding JS file {js_file}: {str(e)}")
-                    pdf.chapter_body(f"[Error processing file: {str(e)}]")
-        
-        # Add images
-        if extracted_files.get('images'):
-            print(f"Adding images: {len(extracted_files['images'])} files")
-            pdf.add_page()
-            pdf.chapter_title("Images")
-            for image_file in extracted_files['images'][:10]:  # Limit to first 10 images
-                try:
-                    pdf.add_file_content(image_file)
-                except Exception as e:
-                    print(f"Error adding image file {image_file}: {str(e)}")
-                    pdf.chapter_body(f"[Error processing file: {str(e)}]")
+        # Read text files in the background while earlier files are laid out;
+        # fpdf itself isn't thread-safe so all layout stays on this thread
+        text_files = [path for file_type, _, _ in REPORT_SECTIONS if file_type != 'images'
+                      for path in extracted_files.get(file_type) or []]
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+            reads = {path: executor.submit(_read_text_file, path) for path in text_files}
             
-            if len(extracted_files['images']) > 10:
-                pdf.chapter_body(f"[{len(extracted_files['images']) - 10} more images not shown]")
+            for file_type, section_title, limit in REPORT_SECTIONS:
+                files = extracted_files.get(file_type)
+                if not files:
+                    continue
+                
+                logger.debug("Adding %s: %d files", section_title, len(files))
+                pdf.add_page()
+                pdf.chapter_title(section_title)
+                seen_images = set()
+                for file_path in files[:limit]:
+                    if file_type == 'images':
+                        # Sites often reuse the same asset under different names
+                        digest = _file_digest(file_path)
+                        if digest is not None:
+                            if digest in seen_images:
+                                logger.debug("Skipping duplicate image %s", file_path)
+                                continue
+                            seen_images.add(digest)
+                    try:
+                        prefetched = reads[file_path].result() if file_path in reads else None
+                        pdf.add_file_content(file_path, prefetched=prefetched)
+                    except Exception as e:
+                        logger.error("Error adding %s file %s: %s", file_type, file_path, e)
+                        pdf.chapter_body(f"[Error processing file: {str(e)}]")
+                
+                if limit is not None and len(files) > limit:
+                    pdf.chapter_body(f"[{len(files) - limit} more {file_type} not shown]")
         
         # Output the PDF
-        print(f"Writing PDF to {output_path}")
-        pdf.output(output_path)
-        print(f"PDF generation complete: {output_path}")
+        logger.debug("Writing PDF to %s", output_path)
+        # fpdf2 returns the document as a bytearray when given no file name
+        _write_pdf(pdf.output(), output_path)
+        logger.info("PDF generation complete: %s", output_path)
         return True
     except Exception as e:
-        print(f"Error generating PDF report: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating PDF report: %s", e)
         return False
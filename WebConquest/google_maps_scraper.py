@@ -1,239 +1,768 @@
 import csv
+import json
+import logging
+import logging.handlers
 import time
 import re
 import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+logger = logging.getLogger(__name__)
 
 # --- CONFIG ---
 # SEARCH_QUERY = "private practice doctors glendale arizona"
 SEARCH_QUERIES = ["HIGH END CONSULTANTS in tucson arizona", "welders in tucson arizona", "woodworkers in tucson arizona", "real estate agents in tucson arizona", "counselors in tucson arizona", "landscapers in tucson arizona", "car detailers in tucson arizona", "accountants in tucson arizona", "attorneys in tucson arizona", "plumbers in tucson arizona", "visual artists in tucson arizona", "dry cleaners in tucson arizona", "3D printer businesses in tucson arizona", "yoga studios in tucson arizona", "massage therapists in tucson arizona", "auto repair shops in tucson arizona", "donut shops in tucson arizona", "esthetician in tucson arizona", "pool maintanence in tucson arizona", "Deli stores in tucson arizona", "doggy day care centers in tucson arizona", "chiropractitioners in tucson arizona", "pawn shops in tucson arizona"  ]
-DELAY_BETWEEN_ACTIONS = 5  # seconds (increased for better loading)
+LOG_LEVEL = logging.INFO  # DEBUG shows per-listing progress, WARNING only problems
+DELAY_BETWEEN_ACTIONS = 5  # Maximum seconds to wait for a clicked listing's details to open
 MAX_RESULTS = 3000  # Maximum number of results to process
 MAX_SCROLL_ATTEMPTS = 20  # Increased scrolling to find more results
 MAX_PAGINATION_PAGES = 60  # Number of pagination pages to navigate
+MIN_NEW_RESULTS_PER_PAGE = 2  # Stop paginating once a page adds fewer new listings than this
 CLICK_RETRY_ATTEMPTS = 5  # Number of times to retry clicking a stale element
+STALE_BACKOFF = 0.25  # Seconds before the first stale retry, doubled on each retry
 WAIT_TIMEOUT = 10  # Maximum seconds to wait for an element
+HEADLESS = True  # Set to False to watch the browser while debugging
+SAVE_SCREENSHOTS = False  # Save a screenshot of every results page while debugging
+SCROLL_WAIT_TIMEOUT = 3  # Maximum seconds to wait for a scroll to load more results
+SCROLL_STABLE_LIMIT = 2  # Stop scrolling after this many scrolls in a row load nothing
+SCROLL_POLL_INTERVAL = 0.1  # Seconds between scroll height checks
+BROWSER_POOL_SIZE = 4  # Number of browsers running queries in parallel
+MAX_USES_PER_INSTANCE = 10  # Queries a browser runs before it is restarted to free memory
+DETAIL_MAX_USES = 500  # Detail pages a detail pool browser opens before it is restarted
+SHARE_BROWSER = True  # Run all workers as tabs of one Chrome instead of one Chrome each
+REMOTE_DEBUGGING_PORT = 9222  # DevTools port the shared Chrome listens on
+DEBUGGER_ADDRESS = f"127.0.0.1:{REMOTE_DEBUGGING_PORT}"
+# Detail pages loaded at once across all queries, as tabs of the shared Chrome
+# or as separate Chromes when SHARE_BROWSER is off. 0 loads them one at a time
+# on each query's own browser.
+DETAIL_TABS = 6
+PLACE_CACHE_PATH = os.path.join('results', '.place_cache.db')  # Extracted businesses by place ID
+PLACE_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # Seconds; Google's terms cap caching at 30 days
+DRIVER_POOL_MAXSIZE = 20  # Keep-alive connections to ChromeDriver per session
+# browser.get() returns at DOMContentLoaded instead of waiting for every map
+# tile and XHR; the explicit waits then block on the elements actually needed
+PAGE_LOAD_STRATEGY = 'eager'
+# Resources never read by the scraper, blocked in every tab to cut page weight.
+# JavaScript is left alone since Google Maps needs it to render results.
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.woff*", "*.css",
+    "*googletagmanager*", "*doubleclick*",
+]
+# When set, businesses are fetched from the Google Places API instead of by
+# driving a browser through Google Maps
+PLACES_API_KEY = os.environ.get("GOOGLE_PLACES_API_KEY")
+PLACES_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
+PLACES_FIELD_MASK = "places.displayName,places.nationalPhoneNumber,places.websiteUri,nextPageToken"
+PLACES_PAGE_SIZE = 20  # Largest page the Text Search endpoint returns
+# Zero out animation and transition durations so scrolling and result cards
+# settle immediately instead of easing into place
+DISABLE_ANIMATIONS_SCRIPT = (
+    "var s = document.createElement('style');"
+    "s.textContent = '*, *::before, *::after {transition-duration: 0s !important;"
+    " animation-duration: 0s !important; scroll-behavior: auto !important}';"
+    "document.head.appendChild(s);"
+)
+# Read everything the listing cards show for a whole page of results in one
+# WebDriver round trip. arguments[1] is PHONE_RE's pattern.
+LISTING_CARDS_SCRIPT = (
+    "const phoneRe = new RegExp(arguments[1]);"
+    "return arguments[0].map(e => {"
+    " const link = e.matches('a[href*=\"/maps/place/\"]') ? e : e.querySelector('a[href*=\"/maps/place/\"]');"
+    " const heading = e.querySelector('.fontHeadlineSmall');"
+    " const site = e.querySelector('a[data-value=\"Website\"], a[data-item-id=\"authority\"]');"
+    " const text = e.innerText || '';"
+    " const phone = text.match(phoneRe);"
+    " return {href: link ? link.href : (e.href || e.getAttribute('href')),"
+    " name: heading ? heading.innerText : null, text: text,"
+    " aria_label: e.getAttribute('aria-label'),"
+    " phone: phone ? phone[0] : null, website: site ? site.href : null};"
+    "});"
+)
+# Phone formats as a single alternation so each card or page text is scanned
+# once:
+# (123) 456-7890, +1 123-456-7890, 123-456-7890
+PHONE_RE = re.compile(r'\(\d{3}\)\s\d{3}-\d{4}|\+1\s\d{3}-\d{3}-\d{4}|\d{3}-\d{3}-\d{4}')
+# Place ID segment of a /maps/place/ link, e.g. ".../data=!4m7!3m6!1s0x86d6...:0x1a2b!8m2..."
+PLACE_ID_RE = re.compile(r'!1s([^!?&]+)')
+# Read the name, phone and website off a detail page inside the browser, so
+# only those strings cross the driver connection instead of the whole page
+# source. The phone button is preferred; the page text is searched with
+# PHONE_RE's pattern when the button is missing.
+DETAIL_FIELDS_SCRIPT = (
+    "(() => {"
+    " const phoneRe = new RegExp(%s);"
+    " const heading = document.querySelector('h1');"
+    " const phoneButton = document.querySelector('[data-item-id^=\"phone\"]');"
+    " const site = document.querySelector('a[data-item-id=\"authority\"], a[aria-label*=\"Website\"], a[data-value=\"Website\"]');"
+    " const phone = (phoneButton ? phoneButton.innerText : document.body.innerText).match(phoneRe);"
+    " return {name: heading ? heading.innerText : null,"
+    " phone: phone ? phone[0] : null, website: site ? site.href : null};"
+    "})()"
+) % json.dumps(PHONE_RE.pattern)
+# Element locators, as (By, value) tuples shared by every call. CSS selectors
+# are used wherever they can express the query since Chrome evaluates them
+# faster than XPath.
+CONSENT_LOCATOR = (By.XPATH, '//button[contains(text(), "Accept") or contains(text(), "I agree")]')
+SEARCH_BOX_LOCATOR = (By.ID, "searchboxinput")
+FEED_LOCATOR = (By.CSS_SELECTOR, 'div[role="feed"]')
+OVERLAY_BUTTON_LOCATOR = (By.CSS_SELECTOR, 'button[class="e2moi"]')
+DETAIL_HEADING_LOCATOR = (By.TAG_NAME, 'h1')
+PAGE_BODY_LOCATOR = (By.TAG_NAME, 'body')
+LISTING_CHILD_LOCATOR = (By.CSS_SELECTOR, 'a, button')
+RESULTS_PANEL_LOCATORS = (
+    (By.CSS_SELECTOR, 'div[aria-label*="Results for"]'),
+    FEED_LOCATOR,
+    (By.CSS_SELECTOR, 'div[class*="section-result-content"]'),
+    (By.CSS_SELECTOR, 'div[class="section-layout-root"]'),
+)
+LISTING_LOCATORS = (
+    (By.CSS_SELECTOR, 'div[aria-label*="Results for"] > div[role*="article"]'),
+    (By.CSS_SELECTOR, 'div[role="article"]'),
+    (By.CSS_SELECTOR, 'div[class*="dbg0pd"]'),  # Business names sometimes have this class
+    (By.CSS_SELECTOR, 'a[href*="maps/place"]'),  # Links to business details
+)
+# Relative to a listing element
+LISTING_NAME_LOCATORS = (
+    (By.CSS_SELECTOR, 'div[class*="fontHeadlineSmall"]'),
+    (By.CSS_SELECTOR, 'div[role="heading"]'),
+    (By.TAG_NAME, 'h3'),
+    (By.CSS_SELECTOR, 'div[class*="dbg0pd"]'),
+)
+NEXT_BUTTON_LOCATORS = (
+    (By.CSS_SELECTOR, 'button[aria-label="Next"]'),
+    (By.CSS_SELECTOR, 'button[jsaction="pane.paginationSection.nextPage"]'),
+    (By.CSS_SELECTOR, 'button[class*="next-page"]'),
+    (By.XPATH, '//button[contains(text(), "Next")]'),  # Text matches need XPath
+    (By.CSS_SELECTOR, 'button[aria-label*="Next page"]'),
+)
+# Result offset in paged search URLs, e.g. "...&start=20"
+START_PARAM_RE = re.compile(r'([?&]start=)(\d+)')
+
+# Serializes the click fallback, which navigates the shared results tab
+_click_lock = threading.Lock()
+
+# First locator that matched for each kind of element, keyed by name; the
+# page layout doesn't change within a run
+_selector_cache = {}
+
 
+def setup_logging(level=LOG_LEVEL):
+    """
+    Send log records through a queue to a background thread that writes them
+    to the console, so the scraping threads never block on console output.
+    Returns the started QueueListener; stop it to flush the remaining records.
+    """
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(levelname)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
 
-def setup_headless_browser():
+
+def setup_headless_browser(remote_debugging_port=None):
     options = Options()
-    # Commenting out headless mode for testing - can see what's happening
-    # options.add_argument('--headless')
-    options.add_argument('--disable-gpu')
+    if remote_debugging_port:
+        # Let other ChromeDriver sessions attach to this browser
+        options.add_argument(f'--remote-debugging-port={remote_debugging_port}')
+    if HEADLESS:
+        # The new headless mode runs the full browser without a window; the
+        # legacy mode (and its --disable-gpu workaround) is slower
+        options.add_argument('--headless=new')
     options.add_argument('--window-size=1920,1080')
     options.add_argument('--no-sandbox')
     options.add_argument('--log-level=3')
+    # Skip everything the scraper never reads: images, web fonts, WebGL map
+    # rendering and Chrome's own background services. These settings belong to
+    # the browser profile, so they also cover tabs of attached drivers.
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_argument('--disable-webgl')
+    options.add_argument('--disable-features=Translate,MediaRouter')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-background-networking')
+    options.add_argument('--disable-sync')
+    options.add_argument('--disable-default-apps')
     # Add user agent to avoid detection
     options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36')
+    browser = _start_chrome(options)
+    block_heavy_resources(browser)
+    return browser
+
+
+def _start_chrome(options):
+    """
+    Start ChromeDriver with a larger keep-alive connection pool and the
+    PAGE_LOAD_STRATEGY page load strategy.
+
+    Every WebDriver command is an HTTP request to ChromeDriver, and the default
+    pool keeps a single connection, so bursts of commands (or several threads
+    on one session) keep reopening sockets.
+    """
+    options.page_load_strategy = PAGE_LOAD_STRATEGY
     service = Service(executable_path="./chromedriver.exe")
-    browser = webdriver.Chrome(service=service, options=options)
+    client_config = ClientConfig(
+        remote_server_addr=service.service_url,
+        keep_alive=True,
+        timeout=120,  # webdriver.Chrome's default
+        # RemoteConnection reads the pool arguments from this nested key
+        init_args_for_pool_manager={
+            "init_args_for_pool_manager": {"maxsize": DRIVER_POOL_MAXSIZE, "block": False},
+        },
+    )
+    return PooledChrome(service, options, client_config)
+
+
+class PooledChrome(webdriver.Remote):
+    """
+    A Chrome driver whose connection to ChromeDriver is configured by a
+    ClientConfig. webdriver.Chrome doesn't accept one, so this starts the
+    service itself, hands webdriver.Remote a ChromiumRemoteConnection, and
+    provides the parts of webdriver.Chrome the scraper relies on: DevTools
+    commands and stopping ChromeDriver on quit.
+    """
+
+    def __init__(self, service, options, client_config):
+        self.service = service
+        service.start()
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=service.service_url,
+            vendor_prefix="goog",
+            browser_name="chrome",
+            client_config=client_config,
+        )
+        try:
+            super().__init__(command_executor=executor, options=options)
+        except Exception:
+            service.stop()
+            raise
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Run a Chrome DevTools protocol command and return its result."""
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self):
+        """Close the browser and stop ChromeDriver."""
+        try:
+            super().quit()
+        finally:
+            self.service.stop()
+
+
+def attach_to_browser(debugger_address):
+    """
+    Start a ChromeDriver session on an already running Chrome (launched with
+    --remote-debugging-port) and give it a tab of its own.
+    """
+    options = Options()
+    options.add_experimental_option("debuggerAddress", debugger_address)
+    browser = _start_chrome(options)
+    browser.switch_to.new_window('tab')
+    block_heavy_resources(browser)
     return browser
 
 
+def block_heavy_resources(browser):
+    """
+    Stop the current tab from loading images, fonts, stylesheets and trackers.
+    The block list is set over the DevTools protocol and applies per tab, so
+    it has to be repeated whenever a driver moves to a new tab.
+    """
+    try:
+        browser.execute_cdp_cmd('Network.enable', {})
+        browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        logger.warning("Could not block page resources: %s", e)
+
+
+def _replace_tab(browser):
+    """Swap the browser's current tab for a fresh one, releasing its renderer."""
+    old_tab = browser.current_window_handle
+    browser.switch_to.new_window('tab')
+    new_tab = browser.current_window_handle
+    browser.switch_to.window(old_tab)
+    browser.close()
+    browser.switch_to.window(new_tab)
+    block_heavy_resources(browser)
+
+
+class BrowserPool:
+    """
+    A fixed set of pre-started browsers shared by the query worker threads.
+
+    Each browser is handed to one thread at a time and is restarted after
+    max_uses borrows (queries, or detail pages for a detail pool) to keep
+    Chrome's memory growth in check; 0 turns recycling off.
+
+    With share=True only one Chrome is launched; the other drivers attach to
+    it over its DevTools endpoint and each works in its own tab, so the pool
+    costs one browser's memory instead of one per worker. Recycling then
+    replaces the worker's tab rather than restarting Chrome. Passing
+    attach_to instead attaches every driver to a Chrome started elsewhere.
+
+    Borrowing blocks while all browsers are in use, so the pool size also
+    bounds how many threads drive browsers at once.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, share=SHARE_BROWSER, attach_to=None,
+                 max_uses=MAX_USES_PER_INSTANCE):
+        self._idle = queue.Queue()
+        self._max_uses = max_uses
+        self._share = share or attach_to is not None
+        self._owner = None
+        if attach_to:
+            for _ in range(size):
+                self._idle.put((attach_to_browser(attach_to), 0))
+        elif share:
+            self._owner = setup_headless_browser(remote_debugging_port=REMOTE_DEBUGGING_PORT)
+            self._idle.put((self._owner, 0))
+            for _ in range(size - 1):
+                self._idle.put((attach_to_browser(DEBUGGER_ADDRESS), 0))
+        else:
+            for _ in range(size):
+                self._idle.put((setup_headless_browser(), 0))
+
+    @contextmanager
+    def browser(self):
+        """Borrow a browser for the duration of a with block."""
+        browser, uses = self._idle.get()
+        try:
+            yield browser
+        finally:
+            uses += 1
+            if self._max_uses and uses >= self._max_uses:
+                logger.info("Recycling browser after %s uses", uses)
+                try:
+                    if self._share:
+                        _replace_tab(browser)
+                    else:
+                        browser.quit()
+                        browser = setup_headless_browser()
+                    uses = 0
+                except Exception as e:
+                    logger.warning("Error recycling browser: %s", e)
+            self._idle.put((browser, uses))
+
+    def close(self):
+        """Quit every idle browser in the pool, the shared Chrome last."""
+        while not self._idle.empty():
+            browser, _ = self._idle.get_nowait()
+            if browser is self._owner:
+                continue
+            try:
+                if self._share:
+                    browser.close()  # Only this driver's tab
+                browser.quit()
+            except Exception as e:
+                logger.warning("Error quitting browser: %s", e)
+        if self._owner is not None:
+            try:
+                self._owner.quit()
+            except Exception as e:
+                logger.warning("Error quitting browser: %s", e)
+
+
+def stale_safe(browser, locator, action, element=None, retries=CLICK_RETRY_ATTEMPTS, backoff=STALE_BACKOFF):
+    """
+    Run action on the element found by locator, re-locating it and replaying
+    the action whenever it goes stale. Google Maps re-renders its panels often,
+    so a WebElement can be replaced between being found and being used.
+
+    :param browser: Selenium WebDriver to search in
+    :param locator: (By, value) tuple used to find the element again
+    :param action: callable taking the element, whose result is returned
+    :param element: optional element already in hand, tried before any lookup
+    :param retries: maximum number of attempts
+    :param backoff: seconds to sleep after the first stale attempt, doubled each time
+    :raises: StaleElementReferenceException if every attempt went stale,
+             TimeoutException if the locator stops matching
+    """
+    for attempt in range(retries):
+        try:
+            if element is None:
+                if locator is None:
+                    raise StaleElementReferenceException("No locator to find the element again")
+                element = WebDriverWait(browser, WAIT_TIMEOUT).until(EC.presence_of_element_located(locator))
+            return action(element)
+        except StaleElementReferenceException:
+            if locator is None or attempt == retries - 1:
+                raise
+            logger.warning("Stale element on attempt %s, re-locating...", attempt+1)
+            element = None
+            time.sleep(backoff * (2 ** attempt))
+
+
+def _js_click(element):
+    """Click through JavaScript, which is not blocked by overlapping elements."""
+    element.parent.execute_script("arguments[0].click();", element)
+    return True
+
+
+def _listing_locator(href, aria_label, text):
+    """
+    Build a (By, value) locator that finds a result listing again. The place
+    link is unique per business, so it is preferred over the label or text.
+    """
+    if href:
+        return (By.CSS_SELECTOR, f'a[href="{href}"]')
+    if aria_label and "'" not in aria_label:
+        return (By.XPATH, f"//div[@aria-label='{aria_label}']")
+    first_line = text.split('\n')[0].strip() if text else ""
+    if first_line and "'" not in first_line:
+        return (By.XPATH, f"//div[.//text()[contains(., '{first_line}')]]")
+    return None
+
+
+class PlaceCache:
+    """
+    On-disk cache of extracted business info keyed by place ID, so a business
+    that shows up in several queries is only clicked through once. Entries
+    older than PLACE_CACHE_MAX_AGE are ignored and refreshed. The connection
+    is shared by all query threads behind a lock.
+    """
+
+    def __init__(self, path=PLACE_CACHE_PATH, max_age=PLACE_CACHE_MAX_AGE):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS places ("
+            "place_id TEXT PRIMARY KEY, name TEXT, phone TEXT, website TEXT, fetched_at REAL)"
+        )
+
+    def get(self, pid):
+        """Return the cached info dict for a place ID, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, phone, website FROM places WHERE place_id = ? AND fetched_at > ?",
+                (pid, time.time() - self._max_age),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "phone": row[1], "website": row[2]}
+
+    def put(self, pid, info):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?)",
+                (pid, info["name"], info["phone"], info["website"], time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def place_id(href):
+    """
+    Return the canonical place ID from a Google Maps place link, so different
+    link variants for the same business compare equal. Falls back to the
+    href itself when it has no place ID segment.
+    """
+    match = PLACE_ID_RE.search(href)
+    return match.group(1) if match else href
+
+
+def disable_animations(browser):
+    """
+    Inject a stylesheet into the current page that turns off CSS animations,
+    transitions and smooth scrolling. It has to be repeated after every page
+    load since the style element goes away with the document.
+    """
+    try:
+        browser.execute_script(DISABLE_ANIMATIONS_SCRIPT)
+    except Exception as e:
+        logger.warning("Could not disable animations: %s", e)
+
+
+def _scroll_height_above(height_script, scroll_args, previous_height):
+    """Wait condition returning the new scroll height once it exceeds previous_height."""
+    def condition(driver):
+        height = driver.execute_script(height_script, *scroll_args)
+        return height if height > previous_height else False
+    return condition
+
+
+def first_match(browser, cache_key, locators):
+    """
+    Return (locator, elements) for the first of locators that finds anything,
+    or (None, []). The locator that matched last time for the same cache_key
+    is tried first, so later calls usually need a single DOM query.
+
+    :param browser: Selenium WebDriver or WebElement to search in
+    :param cache_key: name the winning locator is remembered under
+    :param locators: (By, value) tuples to try in order
+    """
+    cached = _selector_cache.get(cache_key)
+    if cached:
+        locators = (cached,) + tuple(x for x in locators if x != cached)
+    for locator in locators:
+        elements = browser.find_elements(*locator)
+        if elements:
+            _selector_cache[cache_key] = locator
+            return locator, elements
+    return None, []
+
+
+def _next_page_url(url, page_results):
+    """
+    Return the URL of the next result page when the current URL carries a
+    start offset, or None when paging has to go through the next button.
+    """
+    match = START_PARAM_RE.search(url)
+    if not match or not page_results:
+        return None
+    next_start = int(match.group(2)) + page_results
+    return url[:match.start()] + match.group(1) + str(next_start) + url[match.end():]
+
+
 def search_google_maps(browser, query):
     """
     Search Google Maps for a given query and return a list of up to MAX_RESULTS
-    business listings as Selenium WebDriver elements. The search query is used
-    to navigate to the Google Maps search page and the results are collected
-    while scrolling through the results panel. The function takes a maximum
-    number of results to process and a maximum number of pagination pages to
-    navigate. The results are returned as a list of Selenium WebDriver elements
-    which can be used to extract further information.
+    business listings. The search query is used to navigate to the Google Maps
+    search page and the results are collected while scrolling through the
+    results panel. The function takes a maximum number of results to process
+    and a maximum number of pagination pages to navigate. Each listing is a
+    dict of what its card shows ("href", "name", "text", "aria_label", "phone"
+    and "website", read in one script call per page) plus its Selenium
+    WebElement under "element", which can be used to extract further
+    information.
     """
     browser.get("https://www.google.com/maps")
-    time.sleep(DELAY_BETWEEN_ACTIONS)
-    print(f"Searching for: {query}")
+    disable_animations(browser)
+    wait = WebDriverWait(browser, WAIT_TIMEOUT)
+    logger.info("Searching for: %s", query)
     
-    # Handle potential cookie consent or popup
+    # Handle potential cookie consent or popup, waiting only until either the
+    # popup or the search box shows up
     try:
-        consent_buttons = browser.find_elements(By.XPATH, '//button[contains(text(), "Accept") or contains(text(), "I agree")]')
+        wait.until(EC.any_of(
+            EC.element_to_be_clickable(SEARCH_BOX_LOCATOR),
+            EC.presence_of_element_located(CONSENT_LOCATOR),
+        ))
+        consent_buttons = browser.find_elements(*CONSENT_LOCATOR)
         if consent_buttons:
             consent_buttons[0].click()
-            time.sleep(2)
     except Exception as e:
-        print(f"No consent popup or error handling it: {e}")
+        logger.debug("No consent popup or error handling it: %s", e)
     
     # Find and use the search box
     try:
-        search_box = browser.find_element(By.ID, "searchboxinput")
+        search_box = wait.until(EC.element_to_be_clickable(SEARCH_BOX_LOCATOR))
         search_box.clear()
         search_box.send_keys(query)
         search_box.send_keys(Keys.RETURN)
-        print("Search query submitted")
+        logger.debug("Search query submitted")
     except Exception as e:
-        print(f"Error with search box: {e}")
+        logger.warning("Error with search box: %s", e)
         return []
         
-    # Wait longer for results to load
-    time.sleep(DELAY_BETWEEN_ACTIONS * 3)
-    print("Waiting for results to load...")
+    # Wait for the results feed rather than a fixed delay
+    logger.debug("Waiting for results to load...")
+    try:
+        wait.until(EC.presence_of_element_located(FEED_LOCATOR))
+    except TimeoutException:
+        logger.warning("Results feed did not appear, continuing with whatever loaded")
     
     all_result_blocks = []
+    seen_ids = set()  # Place IDs already collected, kept across pages
     current_page = 1
     
     while current_page <= MAX_PAGINATION_PAGES and len(all_result_blocks) < MAX_RESULTS:
-        print(f"\n--- Processing page {current_page} of results ---")
+        logger.info("--- Processing page %s of results ---", current_page)
         
         # Try to find the results panel
         results_panel = None
         try:
             # Multiple possible selectors for the results panel
-            selectors = [
-                '//div[contains(@aria-label, "Results for")]',
-                '//div[@role="feed"]',
-                '//div[contains(@class, "section-result-content")]',
-                '//div[@class="section-layout-root"]'
-            ]
-            
-            for selector in selectors:
-                elements = browser.find_elements(By.XPATH, selector)
-                if elements:
-                    results_panel = elements[0]
-                    print(f"Found results panel with selector: {selector}")
-                    break
-                    
-            if not results_panel:
-                print("Could not find results panel with any selector")
-                # Try scrolling the whole page instead
-                for _ in range(MAX_SCROLL_ATTEMPTS):
-                    browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(1)
+            locator, elements = first_match(browser, "results_panel", RESULTS_PANEL_LOCATORS)
+            if elements:
+                results_panel = elements[0]
+                logger.debug("Found results panel with selector: %s", locator[1])
+            else:
+                logger.warning("Could not find results panel with any selector")
         except Exception as e:
-            print(f"Error finding results panel: {e}")
+            logger.warning("Error finding results panel: %s", e)
         
         # Scroll in the results panel if found, otherwise scroll the whole page
-        print("Scrolling to load more results...")
+        logger.debug("Scrolling to load more results...")
         try:
             if results_panel:
-                for i in range(MAX_SCROLL_ATTEMPTS):
-                    browser.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", results_panel)
-                    print(f"Scroll attempt {i+1}/{MAX_SCROLL_ATTEMPTS}")
-                    time.sleep(2)  # Longer pause between scrolls
+                height_script = "return arguments[0].scrollHeight"
+                scroll_script = "arguments[0].scrollTop = arguments[0].scrollHeight"
+                scroll_args = (results_panel,)
             else:
                 # Scroll the whole page
-                for i in range(MAX_SCROLL_ATTEMPTS):
-                    browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    print(f"Page scroll attempt {i+1}/{MAX_SCROLL_ATTEMPTS}")
-                    time.sleep(2)
+                height_script = "return document.body.scrollHeight"
+                scroll_script = "window.scrollTo(0, document.body.scrollHeight);"
+                scroll_args = ()
+            last_height = browser.execute_script(height_script, *scroll_args)
+            stable = 0
+            for i in range(MAX_SCROLL_ATTEMPTS):
+                browser.execute_script(scroll_script, *scroll_args)
+                logger.debug("Scroll attempt %s/%s", i+1, MAX_SCROLL_ATTEMPTS)
+                # Move on as soon as more results load. A single slow load is
+                # tolerated; stop once several scrolls in a row add nothing
+                try:
+                    last_height = WebDriverWait(browser, SCROLL_WAIT_TIMEOUT, poll_frequency=SCROLL_POLL_INTERVAL).until(
+                        _scroll_height_above(height_script, scroll_args, last_height)
+                    )
+                    stable = 0
+                except TimeoutException:
+                    stable += 1
+                    if stable >= SCROLL_STABLE_LIMIT:
+                        logger.debug("No more results loaded after scrolling")
+                        break
         except Exception as e:
-            print(f"Error while scrolling: {e}")
+            logger.warning("Error while scrolling: %s", e)
         
         # Try multiple selectors for business listings
-        selectors = [
-            '//div[contains(@aria-label, "Results for")]/div[contains(@role, "article")]',
-            '//div[@role="article"]',
-            '//div[contains(@class, "dbg0pd")]',  # Business names sometimes have this class
-            '//a[contains(@href, "maps/place")]'  # Links to business details
-        ]
-        
-        print("Attempting to find business listings...")
+        logger.debug("Attempting to find business listings...")
         result_blocks = []
-        for selector in selectors:
-            try:
-                elements = browser.find_elements(By.XPATH, selector)
-                if elements:
-                    print(f"Found {len(elements)} business listings with selector: {selector}")
-                    result_blocks = elements
-                    break
-            except Exception as e:
-                print(f"Error with selector {selector}: {e}")
+        try:
+            locator, result_blocks = first_match(browser, "listings", LISTING_LOCATORS)
+            if result_blocks:
+                logger.debug("Found %s business listings with selector: %s", len(result_blocks), locator[1])
+        except Exception as e:
+            logger.warning("Error finding business listings: %s", e)
         
         # Add these results to our total
+        results_before = len(all_result_blocks)
         if result_blocks:
-            # Filter out duplicate entries that might already be in all_result_blocks
-            # This is a basic deduplication using href attributes
-            existing_hrefs = set()
-            for existing_block in all_result_blocks:
-                try:
-                    href = existing_block.get_attribute('href')
-                    if href:
-                        existing_hrefs.add(href)
-                except Exception:
-                    pass
-                    
-            for block in result_blocks:
-                try:
-                    href = block.get_attribute('href')
-                    if href and href not in existing_hrefs:
-                        all_result_blocks.append(block)
-                        existing_hrefs.add(href)
-                        if len(all_result_blocks) >= MAX_RESULTS:
-                            break
-                except Exception:
-                    all_result_blocks.append(block)
+            # Read every card on this page with a single script call, then
+            # filter out listings already collected on earlier pages by place ID
+            try:
+                cards = browser.execute_script(LISTING_CARDS_SCRIPT, result_blocks, PHONE_RE.pattern)
+            except Exception as e:
+                logger.warning("Error reading listing cards: %s", e)
+                cards = []
+                all_result_blocks.extend({"element": block} for block in result_blocks)
+            
+            for block, card in zip(result_blocks, cards):
+                href = card.get("href")
+                if not href:
+                    continue
+                pid = place_id(href)
+                if pid not in seen_ids:
+                    seen_ids.add(pid)
+                    card["element"] = block
+                    all_result_blocks.append(card)
+                    if len(all_result_blocks) >= MAX_RESULTS:
+                        break
                     
-            print(f"Added new unique results. Total results so far: {len(all_result_blocks)}")
+            logger.info("Added new unique results. Total results so far: %s", len(all_result_blocks))
         
         # Take screenshot for each page
-        browser.save_screenshot(f"google_maps_result_page{current_page}.png")
-        print(f"Screenshot saved as google_maps_result_page{current_page}.png")
+        if SAVE_SCREENSHOTS:
+            browser.save_screenshot(f"google_maps_result_page{current_page}.png")
+            logger.debug("Screenshot saved as google_maps_result_page%s.png", current_page)
         
         # Check if we have enough results already
         if len(all_result_blocks) >= MAX_RESULTS:
-            print(f"Reached maximum result limit of {MAX_RESULTS}")
+            logger.info("Reached maximum result limit of %s", MAX_RESULTS)
+            break
+        
+        # A page that adds next to nothing means the results are exhausted
+        new_results = len(all_result_blocks) - results_before
+        if new_results < MIN_NEW_RESULTS_PER_PAGE:
+            logger.info("Only %s new results on this page, stopping pagination", new_results)
             break
             
         # Try to navigate to next page of results if available
         if current_page < MAX_PAGINATION_PAGES:
             try:
-                # Look for next button with multiple possible selectors
-                next_button_selectors = [
-                    '//button[@aria-label="Next"]',
-                    '//button[@jsaction="pane.paginationSection.nextPage"]',
-                    '//button[contains(@class, "next-page")]',
-                    '//button[contains(text(), "Next")]',
-                    '//button[contains(@aria-label, "Next page")]',
-                ]
+                # Page by URL when the results carry an offset, skipping the click
+                next_url = _next_page_url(browser.current_url, len(result_blocks))
+                if next_url:
+                    logger.info("Loading next page by URL...")
+                    browser.get(next_url)
+                    disable_animations(browser)
+                    wait.until(EC.presence_of_element_located(FEED_LOCATOR))
+                    current_page += 1
+                    continue
                 
-                next_button = None
-                for selector in next_button_selectors:
-                    buttons = browser.find_elements(By.XPATH, selector)
-                    if buttons and len(buttons) > 0:
-                        next_button = buttons[0]
-                        break
-                        
+                _, next_buttons = first_match(browser, "next_button", NEXT_BUTTON_LOCATORS)
+                next_button = next_buttons[0] if next_buttons else None
                 if next_button and next_button.is_enabled():
-                    print("Clicking next page button...")
+                    logger.info("Clicking next page button...")
                     # Use JavaScript click to avoid interception issues
                     browser.execute_script("arguments[0].click();", next_button)
-                    time.sleep(DELAY_BETWEEN_ACTIONS * 2)  # Wait for next page to load
+                    # Wait for the current listings to be replaced by the next page
+                    if result_blocks:
+                        wait.until(EC.staleness_of(result_blocks[0]))
                     current_page += 1
                 else:
-                    print("No more pages available or next button not found")
+                    logger.info("No more pages available or next button not found")
                     break
             except Exception as e:
-                print(f"Error navigating to next page: {e}")
+                logger.warning("Error navigating to next page: %s", e)
                 break
         else:
-            print(f"Reached maximum pagination limit of {MAX_PAGINATION_PAGES} pages")
+            logger.info("Reached maximum pagination limit of %s pages", MAX_PAGINATION_PAGES)
             break
     
     # Return results up to the maximum
     max_to_return = min(len(all_result_blocks), MAX_RESULTS)
-    print(f"Final count: Returning {max_to_return} business listings out of {len(all_result_blocks)} found across {current_page} pages")
+    logger.info("Final count: Returning %s business listings out of %s found across %s pages", max_to_return, len(all_result_blocks), current_page)
     return all_result_blocks[:max_to_return]
 
 
-def extract_business_info(result_block):
+def extract_business_info(listing, cache=None, detail_browser=None):
     """
-    Extracts business information from a Google Maps result block
-    :param result_block: Selenium WebElement representing the result block
+    Extracts business information from a Google Maps listing. When the card
+    already shows a phone number it is fully rendered, so its data (including
+    whether it has a website button) is used without opening the detail page.
+    :param listing: listing dict from search_google_maps
+    :param cache: optional PlaceCache; a cached listing is returned without
+                  opening its detail page
+    :param detail_browser: optional driver to open the detail page with, so
+                  several listings can be loaded at once on separate drivers;
+                  defaults to the driver that found the result block. The
+                  search browser may already be running another query then,
+                  so listings without a place link are not clicked.
     :return: dict with extracted information including name, phone, and website
     :raises: Exception if detail extraction fails
     """
     info = {"name": "", "phone": "", "website": None}
+    result_block = listing["element"]
+    browser = result_block.parent
+    href = listing.get("href")
+    element_text = listing.get("text")
+    element_aria_label = listing.get("aria_label")
+    
+    pid = place_id(href) if href else None
+    if cache is not None and pid:
+        cached = cache.get(pid)
+        if cached is not None:
+            logger.debug("Using cached details for: %s", cached['name'])
+            return cached
     
     # First get basic details directly from the listing
     try:
-        # New approach to get the href attribute which often contains the business name
-        href = result_block.get_attribute('href')
+        # The href attribute often contains the business name
         if href and '/maps/place/' in href:
             # Extract business name from URL
             business_name_from_url = href.split('/maps/place/')[1].split('/')[0]
@@ -241,244 +770,333 @@ def extract_business_info(result_block):
             business_name_from_url = business_name_from_url.split(',')[0]  # Remove address parts
             if business_name_from_url:
                 info["name"] = business_name_from_url
-                print(f"Found business name from URL: {info['name']}")
+                logger.debug("Found business name from URL: %s", info['name'])
     except Exception as e:
-        print(f"Error extracting from URL: {e}")
+        logger.warning("Error extracting from URL: %s", e)
+    
+    # Then the card's heading
+    if not info["name"] and listing.get("name"):
+        info["name"] = listing["name"].strip()
+        logger.debug("Found business name from card: %s", info['name'])
     
     # If we couldn't get name from URL, try direct text content
     if not info["name"]:
         try:
             # Try to get direct text content of the element
-            text_content = result_block.text
+            text_content = element_text
             if text_content:
                 # The first line is often the business name
                 lines = text_content.split('\n')
                 if lines and lines[0].strip():
                     info["name"] = lines[0].strip()
-                    print(f"Found business name from text: {info['name']}")
+                    logger.debug("Found business name from text: %s", info['name'])
         except Exception as e:
-            print(f"Error getting text content: {e}")
+            logger.warning("Error getting text content: %s", e)
     
     # If still no name, try specific selectors
     if not info["name"]:
-        name_selectors = [
-            './/div[contains(@class, "fontHeadlineSmall")]',
-            './/div[@role="heading"]',
-            './/h3',
-            './/div[contains(@class, "dbg0pd")]'
-        ]
-        
-        for selector in name_selectors:
-            try:
-                elements = result_block.find_elements(By.XPATH, selector)
-                if elements and elements[0].text.strip():
-                    info["name"] = elements[0].text.strip()
-                    print(f"Found business name from selector: {info['name']}")
-                    break
-            except Exception:
-                continue
+        try:
+            _, elements = first_match(result_block, "listing_name", LISTING_NAME_LOCATORS)
+            if elements and elements[0].text.strip():
+                info["name"] = elements[0].text.strip()
+                logger.debug("Found business name from selector: %s", info['name'])
+        except Exception as e:
+            logger.warning("Error finding business name: %s", e)
+    
+    # A card that shows the phone number is fully rendered, so trust it
+    # rather than opening the detail page
+    if listing.get("phone"):
+        info["phone"] = listing["phone"]
+        info["website"] = listing.get("website")
+        logger.debug("Using card details for: %s", info['name'])
+        if cache is not None and pid:
+            cache.put(pid, info)
+        return info
     
-    # Click on the listing to get more details
+    # Load the detail page, in a tab of its own when the listing has a place
+    # link so the results panel is left untouched
     try:
-        if info["name"]:
-            print(f"Clicking on listing for: {info['name']}")
+        if href and '/maps/place/' in href:
+            fields = open_detail_tab(detail_browser or browser, href)
+        elif detail_browser is not None:
+            logger.debug("No place link to open for: %s", info['name'])
+            fields = None
         else:
-            print("Clicking on unnamed listing")
-            
-        # Store the current window handle before clicking
-        browser = result_block.parent
-        main_window = browser.current_window_handle
+            fields = _click_for_details(browser, result_block, info, href, element_text, element_aria_label)
+        if fields is None:
+            return info  # Continue with what data we have
         
-        # Create a reference to find the element again if it becomes stale
-        element_xpath = None
-        element_reference = None
+        _apply_detail_fields(fields, info)
         
-        # Try to get a unique identifier for this element to find it again if needed
+        # Remember the details so the listing isn't opened again by a later
+        # query, unless the page failed to load; caching an empty read would
+        # report the business as having no website for PLACE_CACHE_MAX_AGE
+        read_ok = any(fields.get(key) for key in ("name", "phone", "website"))
+        if cache is not None and pid and read_ok:
+            cache.put(pid, info)
+        elif not read_ok:
+            logger.warning("Nothing read from the detail page of: %s", info['name'])
+    except Exception as e:
+        logger.warning("Error during detail extraction: %s", e)
+    
+    return info
+
+
+def open_detail_tab(browser, href):
+    """
+    Open a place link in a new background tab created over the DevTools
+    protocol, return its detail fields and close the tab again. Nothing in the
+    original tab is clicked, so its result elements never go stale.
+    """
+    main_window = browser.current_window_handle
+    target_id = browser.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank', 'background': True})['targetId']
+    try:
+        # ChromeDriver uses the DevTools target ID as the window handle
+        browser.switch_to.window(target_id)
+        block_heavy_resources(browser)
+        logger.debug("Opening detail page: %s", href)
+        # Navigate over DevTools rather than with get(), which would block on
+        # the page load strategy; the heading wait below is all that's needed
+        browser.execute_cdp_cmd('Page.navigate', {'url': href})
         try:
-            # Get attributes that might help us identify this element later
-            element_text = result_block.text
-            element_class = result_block.get_attribute('class')
-            element_aria_label = result_block.get_attribute('aria-label')
-            
-            # Build potential XPath expressions to find this element again
-            xpath_candidates = []
-            
-            if element_aria_label:
-                xpath_candidates.append(f"//div[@aria-label='{element_aria_label}']")
-                
-            if element_class:
-                xpath_candidates.append(f"//div[@class='{element_class}']")
-            
-            if element_text and len(element_text) > 0:
-                # Use the first line of text which is often the business name
-                first_line = element_text.split('\n')[0].strip()
-                if first_line:
-                    xpath_candidates.append(f"//div[contains(text(), '{first_line}')]")
-                    xpath_candidates.append(f"//div[.//text()[contains(., '{first_line}')]]")
-            
-            # If we have candidates, save the first one for future reference
-            if xpath_candidates:
-                element_xpath = xpath_candidates[0]
-                print(f"Created reference XPath: {element_xpath}")
-        except Exception as e:
-            print(f"Error creating element reference: {e}")
-        
-        # Function to attempt clicking with retries
-        def click_with_retry(element, max_attempts=CLICK_RETRY_ATTEMPTS):
-            for attempt in range(max_attempts):
-                try:
-                    # First try JavaScript click which bypasses interception
-                    browser.execute_script("arguments[0].click();", element)
-                    return True
-                except StaleElementReferenceException:
-                    print(f"Stale element on attempt {attempt+1}, refreshing reference...")
-                    # If we have an XPath, try to find the element again
-                    if element_xpath:
-                        try:
-                            # Wait for the element to be present again
-                            wait = WebDriverWait(browser, WAIT_TIMEOUT)
-                            refreshed_element = wait.until(EC.presence_of_element_located((By.XPATH, element_xpath)))
-                            element = refreshed_element  # Update the reference
-                            continue  # Try again with the new reference
-                        except (TimeoutException, NoSuchElementException):
-                            print("Could not find element with saved XPath")
-                    return False
-                except Exception as e:
-                    print(f"Click error on attempt {attempt+1}: {e}")
-                    if attempt == max_attempts - 1:
-                        return False
-                    time.sleep(1)  # Brief pause before retrying
-            return False
+            WebDriverWait(browser, WAIT_TIMEOUT).until(EC.presence_of_element_located(DETAIL_HEADING_LOCATOR))
+        except TimeoutException:
+            logger.warning("Detail page heading did not appear, using what loaded")
+        return read_detail_fields(browser)
+    finally:
+        browser.execute_cdp_cmd('Target.closeTarget', {'targetId': target_id})
+        browser.switch_to.window(main_window)
+
+
+def _click_for_details(browser, result_block, info, href, element_text, element_aria_label):
+    """
+    Fallback for listings without a place link: click the listing and return
+    the detail view's fields, or None if the listing couldn't be clicked.
+    Clicking changes the results tab, so clicks are made one at a time.
+    """
+    with _click_lock:
+        return _click_and_read(browser, result_block, info, href, element_text, element_aria_label)
+
+
+def _click_and_read(browser, result_block, info, href, element_text, element_aria_label):
+    if info["name"]:
+        logger.debug("Clicking on listing for: %s", info['name'])
+    else:
+        logger.debug("Clicking on unnamed listing")
         
-        # First attempt: Try direct click with retry logic
-        click_success = click_with_retry(result_block)
+    # Store the current window handle before clicking
+    main_window = browser.current_window_handle
+    # Other workers' tabs may share this browser, so only windows opened
+    # by the click below count as detail windows
+    handles_before = set(browser.window_handles)
+    
+    # Locator to find the listing again if its element goes stale
+    listing_locator = _listing_locator(href, element_aria_label, element_text)
+    if listing_locator:
+        logger.debug("Created reference locator: %s", listing_locator[1])
+    
+    # First attempt: click the listing, re-locating it if it goes stale
+    try:
+        stale_safe(browser, listing_locator, _js_click, element=result_block)
+        click_success = True
+    except Exception as e:
+        logger.warning("Direct click failed: %s", e)
+        click_success = False
+    
+    # Second attempt: If direct click failed, try alternative approaches
+    if not click_success:
+        logger.warning("Direct click failed, trying alternatives...")
         
-        # Second attempt: If direct click failed, try alternative approaches
-        if not click_success:
-            print("Direct click failed, trying alternatives...")
+        # Try clicking any overlaying elements first
+        try:
+            overlay_buttons = browser.find_elements(*OVERLAY_BUTTON_LOCATOR)
+            if overlay_buttons:
+                logger.debug("Clicking overlay button first")
+                stale_safe(browser, OVERLAY_BUTTON_LOCATOR, _js_click, element=overlay_buttons[0])
+        except Exception:
+            pass
             
-            # Try clicking any overlaying elements first
-            try:
-                overlay_buttons = browser.find_elements(By.XPATH, '//button[@class="e2moi"]')
-                if overlay_buttons:
-                    print("Clicking overlay button first")
-                    click_with_retry(overlay_buttons[0])
-                    time.sleep(1)
-            except Exception:
-                pass
-                
-            # Try to find a clickable element within the result block
-            try:
-                clickable_elements = result_block.find_elements(By.XPATH, './/a | .//button')
-                if clickable_elements:
-                    print(f"Trying to click child element, found {len(clickable_elements)} options")
-                    click_with_retry(clickable_elements[0])
-            except StaleElementReferenceException:
-                print("Result block became stale when finding child elements")
-                # If we have an XPath, try one final approach with the parent
-                if element_xpath:
-                    try:
-                        wait = WebDriverWait(browser, WAIT_TIMEOUT)
-                        parent_element = wait.until(EC.presence_of_element_located((By.XPATH, element_xpath)))
-                        click_with_retry(parent_element)
-                    except Exception as e:
-                        print(f"Final click attempt failed: {e}")
-                        return info  # Continue with what data we have
-            except Exception as e:
-                print(f"Error finding clickable children: {e}")
-                return info  # Continue with what data we have
-                
-        time.sleep(DELAY_BETWEEN_ACTIONS)  # Wait for details to load
-        
-        # Check if new tab/window opened
-        handles = result_block.parent.window_handles
-        if len(handles) > 1:
-            # Switch to the new tab/window
-            detail_window = [h for h in handles if h != main_window][0]
-            browser.switch_to.window(detail_window)
-        
-        # Now in detail view, try to extract info from the page
-        # Wait for the page to load completely
+        # Try a clickable element within the listing, re-locating the
+        # listing itself if it has been replaced
         try:
-            wait = WebDriverWait(browser, WAIT_TIMEOUT)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            stale_safe(
+                browser, listing_locator,
+                lambda block: _js_click(block.find_element(*LISTING_CHILD_LOCATOR)),
+                element=result_block,
+            )
         except Exception as e:
-            print(f"Error waiting for detail page to load: {e}")
+            logger.warning("Error clicking child element: %s", e)
+            return None
             
-        page_source = browser.page_source
+    # Wait until the details open, in a new window or in place of the
+    # results, instead of a fixed delay
+    try:
+        WebDriverWait(browser, DELAY_BETWEEN_ACTIONS).until(EC.any_of(
+            EC.new_window_is_opened(list(handles_before)),
+            EC.url_contains('/maps/place/'),
+        ))
+    except TimeoutException:
+        logger.warning("Listing details did not open, reading the current page")
+    
+    # Check if new tab/window opened
+    handles = [h for h in browser.window_handles if h not in handles_before]
+    if handles:
+        # Switch to the new tab/window
+        browser.switch_to.window(handles[0])
+    
+    # Wait for the page to load completely
+    try:
+        wait = WebDriverWait(browser, WAIT_TIMEOUT)
+        wait.until(EC.presence_of_element_located(PAGE_BODY_LOCATOR))
+    except Exception as e:
+        logger.warning("Error waiting for detail page to load: %s", e)
         
-        # Extract phone number from page source
-        phone_patterns = [
-            r'\(\d{3}\)\s\d{3}-\d{4}',  # (123) 456-7890
-            r'\d{3}-\d{3}-\d{4}',          # 123-456-7890
-            r'\+1\s\d{3}-\d{3}-\d{4}'      # +1 123-456-7890
-        ]
+    fields = read_detail_fields(browser)
+    
+    # Return to main window if we switched
+    if handles:
+        browser.switch_to.window(main_window)
+    return fields
+
+
+def read_detail_fields(browser):
+    """
+    Return the current tab's detail page name, phone and website as a dict,
+    evaluated in the page over the DevTools protocol. Values not found on the
+    page are None.
+    """
+    result = browser.execute_cdp_cmd('Runtime.evaluate', {
+        'expression': DETAIL_FIELDS_SCRIPT,
+        'returnByValue': True,
+    })
+    if 'exceptionDetails' in result:
+        logger.warning("Error reading detail page: %s", result['exceptionDetails'].get('text'))
+    return result.get('result', {}).get('value') or {}
+
+
+def _apply_detail_fields(fields, info):
+    """Fill in the phone, website and (if missing) name from a detail page's fields."""
+    if fields.get("phone"):
+        info["phone"] = fields["phone"]
+        logger.debug("Found phone: %s", info['phone'])
+    
+    # Use the detail page heading if the listing had no usable name
+    if not info["name"] and fields.get("name"):
+        info["name"] = fields["name"].strip()
+        logger.debug("Found business name from detail page: %s", info['name'])
+    
+    # Links back into Google are not the business's own website
+    website = fields.get("website")
+    if website and not website.startswith('https://www.google.com'):
+        info["website"] = website
+        logger.debug("Found website: %s", info['website'])
+
+
+def search_places_api(query, session=None):
+    """
+    Look up businesses for a query with the Places API Text Search endpoint.
+
+    This returns the same name/phone/website records as the Selenium path
+    (search_google_maps + extract_business_info) from a few JSON requests,
+    without rendering Google Maps at all. Google's terms only allow caching
+    Places content for up to 30 days, so saved CSVs should be refreshed
+    accordingly.
+
+    Args:
+        query (str): Text search query, e.g. "plumbers in tucson arizona"
+        session (requests.Session, optional): Session to reuse connections
+
+    Returns:
+        list[dict]: Up to MAX_RESULTS dicts with "name", "phone" and "website"
+    """
+    if session is None:
+        session = requests
+    headers = {
+        "X-Goog-Api-Key": PLACES_API_KEY,
+        "X-Goog-FieldMask": PLACES_FIELD_MASK,
+    }
+    businesses = []
+    page_token = None
+    while len(businesses) < MAX_RESULTS:
+        body = {"textQuery": query, "pageSize": PLACES_PAGE_SIZE}
+        if page_token:
+            body["pageToken"] = page_token
+        response = session.post(PLACES_SEARCH_URL, json=body, headers=headers, timeout=WAIT_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
         
-        for pattern in phone_patterns:
-            import re
-            matches = re.findall(pattern, page_source)
-            if matches:
-                info["phone"] = matches[0]
-                print(f"Found phone from pattern: {info['phone']}")
-                break
+        for place in data.get("places", []):
+            businesses.append({
+                "name": place.get("displayName", {}).get("text", ""),
+                "phone": place.get("nationalPhoneNumber", ""),
+                "website": place.get("websiteUri"),
+            })
         
-        # Extract website URL
-        # First try to find the website button and click it
-        website_buttons = [
-            '//a[contains(@aria-label, "Website")]',
-            '//a[contains(@data-item-id, "authority")]',
-            '//a[contains(text(), "Website")]',
-            '//button[contains(text(), "Website")]'
-        ]
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            break
+    
+    logger.info("Places API returned %s businesses for: %s", len(businesses), query)
+    return businesses[:MAX_RESULTS]
+
+
+class ResultSink:
+    """
+    Streams businesses to the query's CSV file as they are extracted.
+
+    The file is opened and its header written when the with block starts, and
+    each business is flushed as soon as it is added, so a crash part way
+    through a query keeps everything scraped so far. Only businesses without a
+    website are written; the results are saved in the "results" directory with
+    a filename based on the search query.
+    """
+
+    def __init__(self, search_query=None):
+        if search_query is None:
+            search_query = SEARCH_QUERY  # Default to global SEARCH_QUERY if not provided
         
-        for selector in website_buttons:
-            try:
-                elements = browser.find_elements(By.XPATH, selector)
-                if elements:
-                    # Either get href directly or check if it's a button that needs clicking
-                    href = elements[0].get_attribute('href')
-                    if href and not href.startswith('https://www.google.com'):
-                        info["website"] = href
-                        print(f"Found website: {info['website']}")
-                        break
-            except Exception:
-                continue
+        # Convert the search query to a valid filename by replacing invalid characters
+        # and converting to lowercase for consistency
+        filename_base = re.sub(r'[^\w\s-]', '', search_query.lower())
+        filename_base = re.sub(r'[\s-]+', '_', filename_base)
         
-        # If no website found yet, look for patterns in page source
-        if not info["website"]:
-            website_patterns = [
-                r'href="(https?://[^"]+)"[^>]*>\s*Website\s*<',
-                r'data-url="(https?://[^"]+)"'
-            ]
-            
-            for pattern in website_patterns:
-                import re
-                matches = re.findall(pattern, page_source)
-                if matches:
-                    for match in matches:
-                        if not match.startswith('https://www.google.com'):
-                            info["website"] = match
-                            print(f"Found website from pattern: {info['website']}")
-                            break
-                    if info["website"]:
-                        break
+        # Create output directory if it doesn't exist
+        output_dir = 'results'
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Return to main window if we switched
-        if len(handles) > 1:
-            browser.switch_to.window(main_window)
-            
-    except Exception as e:
-        print(f"Error during detail extraction: {e}")
-    
-    return info
+        # with_website_filename = os.path.join(output_dir, f"{filename_base}_with_website.csv")  # COMMENTED OUT: Disabling generation of with_website CSV file
+        self.without_website_filename = os.path.join(output_dir, f"{filename_base}_without_website.csv")
+        self.count = 0
+        self.without_website_count = 0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        logger.info("Saving results to: %s", self.without_website_filename)
+        self._file = open(self.without_website_filename, "w", newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["Name", "Phone"])
+        self._file.flush()
+        return self
+
+    def add(self, biz):
+        """Write one business record if it has no website and flush it to disk."""
+        self.count += 1
+        logger.debug("Business record: %s", biz)
+        if not biz.get("website"):
+            self._writer.writerow([biz.get("name", ""), biz.get("phone", "")])
+            self._file.flush()
+            self.without_website_count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+        logger.info("Saved %s businesses without websites", self.without_website_count)
+        return False
 
 
 def categorize_and_save_to_csv(businesses, search_query=None):
-    # Use the search query to create a filename-friendly string
     """
-    Categorize the businesses into two CSV files based on whether they have a
-    website or not. The files are saved in the "results" directory with
-    filenames based on the search query.
+    Save an already collected list of businesses to the query's CSV file.
 
     Args:
         businesses (list[dict]): A list of dictionaries containing business
@@ -488,41 +1106,87 @@ def categorize_and_save_to_csv(businesses, search_query=None):
         search_query (str, optional): The search query used to obtain the
             businesses. If not provided, the global SEARCH_QUERY variable is
             used.
+    """
+    with ResultSink(search_query) as sink:
+        for biz in businesses:
+            sink.add(biz)
+
+
+def _save_results(query, infos, total):
+    """Stream extracted businesses to the query's CSV file, returning how many were written."""
+    with ResultSink(query) as sink:
+        for i, info in enumerate(infos):
+            logger.debug("[%s] Processed business %s/%s", query, i+1, total)
+            sink.add(info)
+    return sink.count
 
+
+def _run_query(pool, query, cache=None, detail_pool=None):
     """
-    if search_query is None:
-        search_query = SEARCH_QUERY  # Default to global SEARCH_QUERY if not provided
-    
-    # Convert the search query to a valid filename by replacing invalid characters
-    # and converting to lowercase for consistency
-    filename_base = re.sub(r'[^\w\s-]', '', search_query.lower())
-    filename_base = re.sub(r'[\s-]+', '_', filename_base)
-    
-    # Create output directory if it doesn't exist
-    output_dir = 'results'
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    # Create the filenames with the search query
-    # with_website_filename = os.path.join(output_dir, f"{filename_base}_with_website.csv")  # COMMENTED OUT: Disabling generation of with_website CSV file
-    without_website_filename = os.path.join(output_dir, f"{filename_base}_without_website.csv")
-    
-    print(f"Saving results to:\n - {without_website_filename}")  # COMMENTED OUT: Removed with_website_filename
+    Run one search query end to end, streaming its results to the query's
+    own CSV file. The listings are collected on a browser borrowed from the
+    pool. With a detail_pool that browser is handed back as soon as the
+    search is done, and the listings are extracted in parallel, each on a
+    tab borrowed from the detail pool; otherwise they are extracted one at a
+    time on the search browser.
+    """
+    try:
+        with pool.browser() as browser:
+            # Search for businesses using the configured query
+            logger.info("Starting search for: %s", query)
+            results = search_google_maps(browser, query)
+            if detail_pool is None:
+                count = _save_results(query, (extract_business_info(result, cache) for result in results), len(results))
+        
+        if detail_pool is not None:
+            def extract(result):
+                with detail_pool.browser() as tab:
+                    return extract_business_info(result, cache, detail_browser=tab)
+            
+            with ThreadPoolExecutor(max_workers=DETAIL_TABS) as executor:
+                # map keeps the CSV in result order
+                count = _save_results(query, executor.map(extract, results), len(results))
+        
+        logger.info("Done! %s businesses processed for: %s", count, query)
+    except Exception as e:
+        logger.error("An error occurred while processing '%s': %s", query, e)
+
+
+def _run_all_queries():
+    """Run every configured query through the Places API or the browser pool."""
+    if PLACES_API_KEY:
+        with requests.Session() as session:
+            for query in SEARCH_QUERIES:
+                try:
+                    businesses = search_places_api(query, session)
+                    categorize_and_save_to_csv(businesses, query)
+                except Exception as e:
+                    logger.error("An error occurred while processing '%s': %s", query, e)
+        return
     
-    # Save the data to the CSV files
-    with open(without_website_filename, "w", newline='', encoding='utf-8') as f_without:
-        writer_without = csv.writer(f_without)
-        writer_without.writerow(["Name", "Phone"])
-        # Count for statistics
-        without_website_count = 0
-        for biz in businesses:
-            print(f"Business record: {biz}")  # DEBUG: Show the business dict
-            if not biz.get("website"):
-                writer_without.writerow([biz.get("name", ""), biz.get("phone", "")])
-                without_website_count += 1
-        # print(f"Saved {with_website_count} businesses with websites")  # COMMENTED OUT
-        print(f"Saved {without_website_count} businesses without websites")
-    # COMMENTED OUT: All logic for with_website_filename CSV file
+    pool = BrowserPool()
+    # Drivers that detail pages are opened on, shared by all queries. Each
+    # worker thread drives its own session, so threads don't contend for one
+    # browser's current window.
+    if not DETAIL_TABS:
+        detail_pool = None
+    elif SHARE_BROWSER:
+        detail_pool = BrowserPool(DETAIL_TABS, attach_to=DEBUGGER_ADDRESS, max_uses=DETAIL_MAX_USES)
+    else:
+        detail_pool = BrowserPool(DETAIL_TABS, share=False, max_uses=DETAIL_MAX_USES)
+    cache = PlaceCache()
+    try:
+        with ThreadPoolExecutor(max_workers=BROWSER_POOL_SIZE) as executor:
+            for query in SEARCH_QUERIES:
+                executor.submit(_run_query, pool, query, cache, detail_pool)
+    except Exception as e:
+        logger.error("An error occurred during execution: %s", e)
+    finally:
+        if detail_pool is not None:
+            detail_pool.close()
+        pool.close()
+        cache.close()
+
 
 def main():
     
@@ -531,30 +1195,19 @@ def main():
     Google Maps, processes each result to extract business information, and saves
     the results to CSV files named after the search query.
 
-    The function catches any exceptions that occur during execution and prints
-    an error message before quitting the Selenium browser session.
+    If GOOGLE_PLACES_API_KEY is set, the Places API is queried directly and
+    no browser is started. Otherwise queries run in parallel, one per browser
+    in a BrowserPool. Each query writes its own CSV file, so no locking is
+    needed around the output. Listings already extracted within the last 30
+    days are read from the PlaceCache instead of being clicked again. An error
+    in one query is logged without stopping the others, and every browser is
+    quit at the end.
     """
-    browser = setup_headless_browser()
+    listener = setup_logging()
     try:
-        for SEARCH_QUERY in SEARCH_QUERIES:
-            # Search for businesses using the configured query
-            print(f"Starting search for: {SEARCH_QUERY}")
-            results = search_google_maps(browser, SEARCH_QUERY)
-            
-            # Process each result to extract business information
-            businesses = []
-            for i, result in enumerate(results):
-                print(f"Processing business {i+1}/{len(results)}...")
-                info = extract_business_info(result)
-                businesses.append(info)
-            
-            # Save the results to CSV files named after the search query
-            categorize_and_save_to_csv(businesses, SEARCH_QUERY)
-            print(f"Done! {len(businesses)} businesses processed.")
-    except Exception as e:
-        print(f"An error occurred during execution: {e}")
+        _run_all_queries()
     finally:
-        browser.quit()
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -6,13 +6,17 @@ from a Python client using the Appwrite SDK.
 """
 
 import json
+import time
 import base64
 from io import BytesIO
-import matplotlib.pyplot as plt
 from appwrite.client import Client
 from appwrite.services.functions import Functions
 
-def call_emf_calculator(endpoint, project_id, api_key, function_id, params):
+POLL_INTERVAL = 0.25  # Seconds between execution status checks
+POLL_TIMEOUT = 60  # Seconds to wait for the execution to finish
+
+def call_emf_calculator(endpoint, project_id, api_key, function_id, params,
+                        plot_path='emf_plot', show_plot=False):
     """
     Call the EMF Calculator Appwrite function.
     
@@ -22,6 +26,10 @@ def call_emf_calculator(endpoint, project_id, api_key, function_id, params):
         api_key (str): Your Appwrite API key
         function_id (str): The ID of the EMF Calculator function
         params (dict): The parameters for the EMF calculation
+        plot_path (str): Where to save an inline plot, without extension; the
+            extension is taken from the response's format
+        show_plot (bool): Also open a saved PNG or WebP plot in the default
+            image viewer
         
     Returns:
         dict: The function response with EMF value and plot
@@ -36,32 +44,46 @@ def call_emf_calculator(endpoint, project_id, api_key, function_id, params):
     functions = Functions(client)
     
     try:
-        # Call the function with the parameters
+        # Start the function without holding the connection open while it runs
         print("Calling EMF Calculator function...")
         execution = functions.create_execution(
             function_id=function_id,
             data=json.dumps(params),
-            async_execution=False
+            xasync=True
         )
         
+        # Poll until the execution has finished
+        execution_id = execution['$id']
+        deadline = time.monotonic() + POLL_TIMEOUT
+        while execution['status'] not in ('completed', 'failed'):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Execution {execution_id} did not finish within {POLL_TIMEOUT} seconds")
+            time.sleep(POLL_INTERVAL)
+            execution = functions.get_execution(function_id, execution_id)
+        
         # Parse the response
-        response = json.loads(execution.response)
+        response = json.loads(execution['response'])
         
         if response.get('success', False):
             print(f"EMF Calculation successful! EMF = {response['emf']} Volts")
             
-            # If you want to display the plot
-            if 'plot' in response:
-                # Decode the base64 plot
+            # The plot is either uploaded to Storage and linked, or sent inline
+            # as an encoded image to save as it is. Both are None when the
+            # plot was turned off with include_plot.
+            if response.get('plot_url'):
+                print(f"Plot available at {response['plot_url']}")
+            elif response.get('plot'):
+                plot_format = response.get('format') or 'png'
+                plot_file = f"{plot_path}.{plot_format}"
                 plot_data = base64.b64decode(response['plot'])
+                with open(plot_file, 'wb') as f:
+                    f.write(plot_data)
+                print(f"Plot saved to {plot_file}")
                 
-                # Create a plot from the image data
-                plt.figure(figsize=(10, 6))
-                img = plt.imread(BytesIO(plot_data), format='png')
-                plt.imshow(img)
-                plt.axis('off')
-                plt.tight_layout()
-                plt.show()
+                if show_plot and plot_format != 'svg':
+                    # Pillow is only needed to display the plot
+                    from PIL import Image
+                    Image.open(BytesIO(plot_data)).show()
             
             return response
         else:
@@ -1,13 +1,118 @@
 import io
 import base64
 import json
+import threading
+from math import pi
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+# Use the non-interactive Agg backend instead of probing for a GUI one; plots
+# are only ever rendered to bytes
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 from appwrite.client import Client
 from appwrite.exception import AppwriteException
+from appwrite.input_file import InputFile
+from appwrite.services.storage import Storage
 import os
 
+# orjson is optional and parses/serializes faster than the json module. Its
+# JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Numba is optional; without it the numeric core runs as plain Python
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# One Figure, Axes and output buffer reused by every request; building a new
+# Figure per call costs more than the calculation itself. Guarded by a lock in
+# case the runtime handles requests concurrently.
+_FIG = Figure(figsize=(10, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
+_BUF = io.BytesIO()
+_PLOT_LOCK = threading.Lock()
+
+# savefig options per supported plot format. WebP and SVG skip PNG's deflate
+# pass and give smaller payloads; PNG stays the default for existing clients.
+# SVG plots are written by hand rather than through savefig.
+PLOT_FORMATS = {
+    'png': {},
+    'webp': {'pil_kwargs': {'quality': 85, 'method': 0}},
+    'svg': {},
+}
+DEFAULT_PLOT_FORMAT = 'png'
+
+# Environment read once per container rather than on every request
+_ENDPOINT = os.environ.get('APPWRITE_FUNCTION_API_ENDPOINT')
+_PROJECT_ID = os.environ.get('APPWRITE_FUNCTION_PROJECT_ID')
+_API_KEY = os.environ.get('APPWRITE_API_KEY')
+_CLIENT = None
+
+# When set, plots are uploaded to this Storage bucket and returned as a URL
+# instead of inline base64, which is a third larger than the image itself.
+# Uploads also need APPWRITE_FUNCTION_API_ENDPOINT to build the URL.
+PLOT_BUCKET_ID = os.environ.get('EMF_PLOT_BUCKET_ID')
+
+# Numeric request parameters, all required
+REQUIRED_PARAMS = ('num_turns', 'radius', 'magnetic_field_change', 'time_interval')
+
+# Most parameter sets accepted in one batch request
+MAX_BATCH_SIZE = 10000
+
+# Set EMF_DEBUG to log each request body; serializing it costs time on every call
+DEBUG = bool(os.environ.get('EMF_DEBUG'))
+
+
+def _emf_core(num_turns, radius_cm, magnetic_field_change, time_interval):
+    """
+    Faraday's law for a coil of the given turns and radius (in centimeters)
+    under a field change over time_interval. Returns the induced EMF in volts.
+    """
+    # Convert radius from centimeters to meters
+    radius = radius_cm * 0.01
+    
+    # Calculate area of the coil (πr²) in square meters
+    area = pi * radius * radius
+    
+    # Apply Faraday's law to the change in flux ΔΦ = ΔB·A·N to get the
+    # induced EMF ε = -ΔΦ/Δt in Volts.
+    # Note: The negative sign indicates the direction of the induced EMF (Lenz's law)
+    return -magnetic_field_change * area * num_turns / time_interval
+
+
+if njit is not None:
+    # Compile for float64 arguments when the module loads, with the machine
+    # code cached on disk so later cold starts skip the compile
+    _emf_core = njit('f8(f8, f8, f8, f8)', cache=True)(_emf_core)
+
+
+def _get_client():
+    """
+    Returns the Appwrite client for calling other Appwrite services, creating
+    it on first use and reusing it for the container's lifetime. Returns None
+    when no project is configured.
+    """
+    global _CLIENT
+    if _CLIENT is None and _PROJECT_ID:
+        client = Client()
+        if _ENDPOINT:
+            client.set_endpoint(_ENDPOINT)
+        client.set_project(_PROJECT_ID)
+        if _API_KEY:
+            client.set_key(_API_KEY)
+        _CLIENT = client
+    return _CLIENT
+
 
 def receive_emf_calculation_request(context):
     """
@@ -30,7 +135,7 @@ def receive_emf_calculation_request(context):
         if not hasattr(context.req, 'body_json') or not context.req.body_json:
             # Try to parse the body text if body_json is not available
             if hasattr(context.req, 'body_text') and context.req.body_text:
-                data = json.loads(context.req.body_text)
+                data = _json_loads(context.req.body_text)
             else:
                 return {
                     'success': False,
@@ -40,30 +145,43 @@ def receive_emf_calculation_request(context):
             data = context.req.body_json
         
         # Log the parsed data
-        context.log(f"Request data: {json.dumps(data)}")
+        if DEBUG:
+            context.log(f"Request data: {_json_dumps(data)}")
         
-        # Extract parameters with validation
-        params = {}
-        
-        # Required parameters
-        required_params = ['num_turns', 'radius', 'magnetic_field_change', 
-                          'time_interval']
+        # A "batch" list of parameter sets is validated and calculated together
+        if isinstance(data, dict) and 'batch' in data:
+            if not isinstance(data['batch'], list) or not data['batch']:
+                return {
+                    'success': False,
+                    'error': 'Batch must be a non-empty list of parameter sets'
+                }
+            if len(data['batch']) > MAX_BATCH_SIZE:
+                return {
+                    'success': False,
+                    'error': f"Batch must have at most {MAX_BATCH_SIZE} parameter sets"
+                }
+            if not all(isinstance(item, dict) for item in data['batch']):
+                return {
+                    'success': False,
+                    'error': 'Each batch item must be an object of parameters'
+                }
+            return {
+                'success': True,
+                'batch': data['batch']
+            }
         
         # Validate all required parameters are present
-        missing_params = [param for param in required_params if param not in data]
+        missing_params = [param for param in REQUIRED_PARAMS if param not in data]
         if missing_params:
             return {
                 'success': False,
                 'error': f"Missing required parameters: {', '.join(missing_params)}"
             }
         
-        # Convert and validate parameters
+        # Convert all parameters in one pass with a single error path
         try:
-            params['num_turns'] = float(data['num_turns'])
-            params['radius'] = float(data['radius'])
-            params['magnetic_field_change'] = float(data['magnetic_field_change'])
-            params['time_interval'] = float(data['time_interval'])
-        except ValueError as e:
+            params = {param: float(data[param]) for param in REQUIRED_PARAMS}
+        except (TypeError, ValueError) as e:
             return {
                 'success': False,
                 'error': f"Parameter conversion error: {str(e)}"
@@ -82,6 +200,21 @@ def receive_emf_calculation_request(context):
                 'error': 'Time interval must be a positive value'
             }
         
+        # Optional plot settings; rendering the plot is most of the work, so
+        # clients that only need the EMF value can turn it off
+        params['include_plot'] = data.get('include_plot', True)
+        if not isinstance(params['include_plot'], bool):
+            return {
+                'success': False,
+                'error': 'include_plot must be a boolean'
+            }
+        params['plot_format'] = str(data.get('plot_format', DEFAULT_PLOT_FORMAT)).lower()
+        if params['plot_format'] not in PLOT_FORMATS:
+            return {
+                'success': False,
+                'error': f"Unsupported plot format, expected one of: {', '.join(PLOT_FORMATS)}"
+            }
+        
         # Request is valid
         return {
             'success': True,
@@ -134,13 +267,17 @@ def send_emf_calculation_response(context, calculation_result):
             # Extract the calculation results
             emf = calculation_result.get('emf')
             plot_base64 = calculation_result.get('plot')
+            plot_url = calculation_result.get('plot_url')
+            plot_format = calculation_result.get('format')
             
             # Return success response using Appwrite context.res.json()
             return context.res.json(
                 {
                     'success': True,
                     'emf': emf,
-                    'plot': plot_base64
+                    'plot': plot_base64,
+                    'plot_url': plot_url,
+                    'format': plot_format
                 },
                 status_code=200
             )
@@ -156,6 +293,82 @@ def send_emf_calculation_response(context, calculation_result):
         )
 
 
+# Hand-written SVG for the EMF plot. The EMF is constant, so the plot is
+# always a single horizontal line and doesn't need Matplotlib's layout engine.
+_SVG_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="600" height="360" viewBox="0 0 600 360"'
+    ' font-family="sans-serif" font-size="14">'
+    '<rect width="600" height="360" fill="white"/>'
+    '<text x="300" y="30" text-anchor="middle" font-size="16">Induced EMF over Time</text>'
+    '<path d="M60 50V310H560" fill="none" stroke="black"/>'
+    '<line x1="60" y1="180" x2="560" y2="180" stroke="steelblue" stroke-width="2"/>'
+    '<text x="52" y="185" text-anchor="end">{emf:.4g}</text>'
+    '<text x="60" y="328" text-anchor="middle">0</text>'
+    '<text x="560" y="328" text-anchor="middle">{time_interval:.4g}</text>'
+    '<text x="310" y="350" text-anchor="middle">Time (seconds)</text>'
+    '<text x="20" y="180" text-anchor="middle" transform="rotate(-90 20 180)">EMF (Volts)</text>'
+    '</svg>'
+)
+
+
+def render_emf_plot(time_interval, emf, plot_format=DEFAULT_PLOT_FORMAT, raw=False):
+    """
+    Renders the EMF over time as a base64 encoded image in plot_format, or as
+    the image bytes themselves if raw is True.
+    """
+    if plot_format == 'svg':
+        svg = _SVG_TEMPLATE.format(emf=emf, time_interval=time_interval).encode('ascii')
+        return svg if raw else base64.b64encode(svg).decode('ascii')
+    
+    # The field ramps linearly, so dB/dt (and with it the EMF) is the same
+    # at every instant; the curve is a flat line from 0 to time_interval
+    time_points = [0.0, time_interval]
+    emf_values = [emf, emf]
+
+    # Draw the plot on the shared Axes
+    with _PLOT_LOCK:
+        _AX.clear()
+        _AX.plot(time_points, emf_values)
+        _AX.set_title('Induced EMF over Time')
+        _AX.set_xlabel('Time (seconds)')
+        _AX.set_ylabel('EMF (Volts)')
+        _AX.grid(True)
+
+        # Save plot to a base64 encoded string for JSON transmission
+        _BUF.seek(0)
+        _BUF.truncate()
+        if plot_format == 'png':
+            # Render straight through the Agg canvas, skipping savefig's
+            # format dispatch
+            _CANVAS.print_png(_BUF)
+        else:
+            _FIG.savefig(_BUF, format=plot_format, **PLOT_FORMATS[plot_format])
+        if raw:
+            return _BUF.getvalue()
+        # Encode straight from the buffer's memory instead of a copy of it.
+        # The view must be released before the next truncate() can resize
+        # the buffer.
+        with _BUF.getbuffer() as view:
+            return base64.b64encode(view).decode('ascii')
+
+
+def upload_plot(plot_bytes, plot_format, client):
+    """
+    Uploads a rendered plot to the PLOT_BUCKET_ID Storage bucket and returns
+    the URL to view it.
+    """
+    storage = Storage(client)
+    uploaded = storage.create_file(
+        bucket_id=PLOT_BUCKET_ID,
+        file_id='unique()',
+        file=InputFile.from_bytes(plot_bytes, f"emf_plot.{plot_format}")
+    )
+    return (
+        f"{_ENDPOINT}/storage/buckets/{PLOT_BUCKET_ID}/files/{uploaded['$id']}/view"
+        f"?project={_PROJECT_ID}"
+    )
+
+
 def calculate_emf(params):
     """
     Calculates the induced EMF in a coil based on the input parameters.
@@ -166,6 +379,8 @@ def calculate_emf(params):
             - radius: Wire radius in centimeters
             - magnetic_field_change: Change in magnetic field in teslas
             - time_interval: Time of change in seconds
+            - plot_format: Optional image format of the plot, a key of PLOT_FORMATS
+            - include_plot: Optional, False to skip rendering the plot
         
     Returns:
         dict: Dictionary containing calculation results or error information
@@ -176,53 +391,37 @@ def calculate_emf(params):
         radius_cm = params['radius']
         magnetic_field_change = params['magnetic_field_change']
         time_interval = params['time_interval']
+        plot_format = params.get('plot_format', DEFAULT_PLOT_FORMAT)
         
-        # Convert radius from centimeters to meters
-        radius = radius_cm / 100.0  # convert to meters
-        
-        # Calculate area of the coil (πr²)
-        area = np.pi * radius**2  # in square meters
-        
-        # Calculate change in flux (ΔΦ = ΔB·A·N)
-        delta_flux = magnetic_field_change * area * num_turns  # in Weber
-        
-        # Apply Faraday's law to calculate induced EMF (ε = -N·ΔΦ/Δt)
-        # Note: The negative sign indicates the direction of the induced EMF (Lenz's law)
-        emf = -delta_flux / time_interval  # in Volts
-        
-        # Generate plot of EMF over time
-        # Create an array of time points
-        time_points = np.linspace(0, time_interval, 100)
+        # Calculate the induced EMF
+        emf = float(_emf_core(num_turns, radius_cm, magnetic_field_change, time_interval))
         
-        # Linear change in magnetic field
-        magnetic_field = np.linspace(0, magnetic_field_change, 100)
-        
-        # Calculate flux at each time point
-        flux = magnetic_field * area * num_turns
-        
-        # Calculate EMF at each time point (derivative of flux)
-        emf_values = -num_turns * area * np.gradient(magnetic_field, time_points)
-
-        # Create the plot
-        fig = Figure(figsize=(10, 6))
-        ax = fig.add_subplot(111)
-        ax.plot(time_points, emf_values)
-        ax.set_title('Induced EMF over Time')
-        ax.set_xlabel('Time (seconds)')
-        ax.set_ylabel('EMF (Volts)')
-        ax.grid(True)
-
-        # Save plot to a base64 encoded string for JSON transmission
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png')
-        buf.seek(0)
-        plot_base64 = base64.b64encode(buf.read()).decode('utf-8')
+        # Generate plot of EMF over time unless the client opted out
+        plot_base64 = None
+        plot_url = None
+        client = _get_client() if PLOT_BUCKET_ID and _ENDPOINT else None
+        if not params.get('include_plot', True):
+            plot_format = None
+        elif client is not None:
+            # Upload the raw image and return its URL, skipping base64
+            plot_bytes = render_emf_plot(time_interval, emf, plot_format, raw=True)
+            try:
+                plot_url = upload_plot(plot_bytes, plot_format, client)
+            except AppwriteException:
+                # Storage is unreachable or misconfigured (e.g. a missing API
+                # key or bucket); the calculation still succeeded, so send
+                # the plot inline instead
+                plot_base64 = base64.b64encode(plot_bytes).decode('ascii')
+        else:
+            plot_base64 = render_emf_plot(time_interval, emf, plot_format)
         
         # Return the calculation results
         return {
             'success': True,
             'emf': emf,
-            'plot': plot_base64
+            'plot': plot_base64,
+            'plot_url': plot_url,
+            'format': plot_format
         }
         
     except Exception as e:
@@ -232,6 +431,55 @@ def calculate_emf(params):
         }
 
 
+def calculate_emf_batch(params_list):
+    """
+    Calculates the induced EMF for many parameter sets at once.
+    
+    The parameter sets are converted into one (N, 4) array and validated and
+    calculated with array operations, instead of a Python loop per set. No
+    plots are rendered for batches.
+    
+    Args:
+        params_list: List of dictionaries with the same required keys as
+            calculate_emf
+        
+    Returns:
+        dict: Dictionary with the list of EMF values in Volts, in input order,
+            or error information
+    """
+    try:
+        arr = np.asarray(
+            [[item[param] for param in REQUIRED_PARAMS] for item in params_list],
+            dtype=np.float64
+        )
+    except KeyError as e:
+        return {
+            'success': False,
+            'error': f"Missing required parameter in batch: {e}"
+        }
+    except (TypeError, ValueError) as e:
+        return {
+            'success': False,
+            'error': f"Parameter conversion error: {str(e)}"
+        }
+    
+    num_turns, radius_cm, magnetic_field_change, time_interval = arr.T
+    if not (np.all(radius_cm > 0) and np.all(time_interval > 0)):
+        return {
+            'success': False,
+            'error': 'Radius and time interval must be positive values'
+        }
+    
+    radius = radius_cm * 0.01
+    emfs = -magnetic_field_change * (pi * radius * radius) * num_turns / time_interval
+    return {
+        'success': True,
+        'emf': emfs.tolist(),
+        'plot': None,
+        'format': None
+    }
+
+
 def main(context):
     """
     Main Appwrite function entrypoint for EMF calculator.
@@ -251,12 +499,7 @@ def main(context):
         # Set up logging
         context.log("EMF Calculator function started")
         
-        # Optional: Initialize Appwrite client if needed for other Appwrite services
-        # client = Client()
-        # if 'APPWRITE_FUNCTION_PROJECT_ID' in os.environ:
-        #     client.set_project(os.environ['APPWRITE_FUNCTION_PROJECT_ID'])
-        #     if 'APPWRITE_API_KEY' in os.environ:
-        #         client.set_key(os.environ['APPWRITE_API_KEY'])
+        # Optional: use _get_client() if other Appwrite services are needed
         
         # Step 1: Receive and validate the request
         request_result = receive_emf_calculation_request(context)
@@ -265,7 +508,10 @@ def main(context):
             return send_emf_calculation_response(context, request_result)
         
         # Step 2: Perform the EMF calculation
-        calculation_result = calculate_emf(request_result['params'])
+        if 'batch' in request_result:
+            calculation_result = calculate_emf_batch(request_result['batch'])
+        else:
+            calculation_result = calculate_emf(request_result['params'])
         
         # Step 3: Send the response
         return send_emf_calculation_response(context, calculation_result)
@@ -279,3 +525,21 @@ def main(context):
             },
             status_code=500
         )
+
+
+def _prewarm():
+    """
+    Runs one calculation and plot when the module loads, so a new container
+    pays for Numba compilation, the font cache and the first draw before it
+    serves a request instead of during the first one.
+    """
+    try:
+        emf = _emf_core(1.0, 1.0, 1.0, 1.0)
+        render_emf_plot(1.0, emf)
+    except Exception:
+        pass
+
+
+# Set EMF_PREWARM=0 to skip the warm-up, e.g. in tests
+if os.environ.get('EMF_PREWARM', '1') == '1':
+    _prewarm()
@@ -106,3 +106,89 @@ if result["status_code"] == 200:
 else:
     print(f"Error: {result['body']['message'] if 'message' in result['body'] else 'Unknown error'}")
     print(f"Status code: {result['status_code']}")
+
+
+# Request cases for the batch path and the plot options, checked by status
+# code and response fields
+valid_params = {
+    'num_turns': 100,
+    'radius': 5,  # centimeters
+    'magnetic_field_change': 0.3,  # Tesla
+    'time_interval': 0.1  # seconds
+}
+
+test_cases = [
+    (
+        "Valid batch",
+        {'batch': [valid_params, dict(valid_params, num_turns=200)]},
+        200,
+        lambda body: isinstance(body['emf'], list) and len(body['emf']) == 2
+                     and abs(body['emf'][1] - 2 * body['emf'][0]) < 1e-12,
+    ),
+    (
+        "Batch item missing a key",
+        {'batch': [valid_params, {'num_turns': 100, 'radius': 5, 'time_interval': 0.1}]},
+        400,
+        lambda body: 'magnetic_field_change' in body['message'],
+    ),
+    (
+        "Batch item that is not an object",
+        {'batch': [valid_params, [100, 5, 0.3, 0.1]]},
+        400,
+        lambda body: 'object' in body['message'],
+    ),
+    (
+        "Batch item with a non-positive radius",
+        {'batch': [valid_params, dict(valid_params, radius=0)]},
+        400,
+        lambda body: 'positive' in body['message'],
+    ),
+    (
+        "Batch over the size limit",
+        {'batch': [valid_params] * 10001},
+        400,
+        lambda body: 'at most' in body['message'],
+    ),
+    (
+        "Plot turned off",
+        dict(valid_params, include_plot=False),
+        200,
+        lambda body: body['plot'] is None and body['format'] is None,
+    ),
+    (
+        "Plot option given as a string",
+        dict(valid_params, include_plot="false"),
+        400,
+        lambda body: 'include_plot must be a boolean' in body['message'],
+    ),
+    (
+        "SVG plot",
+        dict(valid_params, plot_format='svg'),
+        200,
+        lambda body: body['format'] == 'svg'
+                     and base64.b64decode(body['plot']).startswith(b'<svg'),
+    ),
+    (
+        "WebP plot",
+        dict(valid_params, plot_format='webp'),
+        200,
+        lambda body: body['format'] == 'webp'
+                     and Image.open(io.BytesIO(base64.b64decode(body['plot']))).format == 'WEBP',
+    ),
+    (
+        "Unsupported plot format",
+        dict(valid_params, plot_format='bmp'),
+        400,
+        lambda body: 'Unsupported plot format' in body['message'],
+    ),
+]
+
+print("\n=== Request Cases ===")
+failures = 0
+for description, body, expected_status, check in test_cases:
+    result = main(MockContext(body))
+    passed = result["status_code"] == expected_status and check(result["body"])
+    if not passed:
+        failures += 1
+    print(f"{'PASS' if passed else 'FAIL'}: {description}")
+print(f"{len(test_cases) - failures}/{len(test_cases)} request cases passed")
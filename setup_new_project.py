@@ -17,17 +17,57 @@ Options:
 
 import os
 import sys
+import shutil  # For finding uv on the PATH
 import argparse  # For parsing command-line arguments
 import subprocess  # For running shell commands
 import platform  # For detecting the operating system
 from pathlib import Path  # For cross-platform path handling
 
-def create_project_structure(project_name):
+# Templates for the generated files, filled in with str.format(project_name=...)
+# and, for the README, the tool's commands from VENV_COMMANDS
+
+# Main Python file with a basic entry point
+MAIN_TEMPLATE = '''"""{project_name} - A new Python project"""
+
+def main():
+    print("Hello, World!")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+# README.md with setup instructions and usage examples
+README_TEMPLATE = ("# {project_name}\n\n"
+                   "## Description\n"
+                   "A new Python project.\n\n"
+                   "## Setup\n"
+                   "1. Create a virtual environment\n"
+                   "   ```powershell\n"
+                   "   cd {project_name}\\n   {create_venv}\n   .\\venv\\Scripts\\activate\n   {pip} install -r requirements.txt\n   ```\n"
+                   "\n## Usage\n"
+                   "Run `python {project_name}.py`")
+
+# requirements.txt for managing Python dependencies with pip
+REQUIREMENTS_TEMPLATE = ("# Add your project dependencies here\n"
+                         "# Example:\n"
+                         "# requests==2.31.0\n"
+                         "# numpy>=1.21.0\n")
+
+# Commands to create the environment and install packages, by the tool the
+# environment is made with. Environments made by uv have no pip of their own.
+VENV_COMMANDS = {
+    "venv": {"create_venv": "python -m venv venv", "pip": "pip"},
+    "uv": {"create_venv": "uv venv venv", "pip": "uv pip"},
+}
+
+def create_project_structure(project_name, venv_tool="venv"):
     """
     Creates the basic project directory structure and files.
     
     Args:
         project_name (str): Name of the project/directory to create
+        venv_tool (str): "venv" or "uv", the tool the README's setup steps use
         
     Returns:
         Path: Path object pointing to the created project directory
@@ -37,59 +77,60 @@ def create_project_structure(project_name):
     project_dir = Path(project_name)
     project_dir.mkdir(exist_ok=True)  # exist_ok=True prevents errors if directory exists
     
-    # Create main Python file with the same name as the project
-    # This follows Python naming conventions for the main module
-    main_py = project_dir / f"{project_name}.py"  # Uses pathlib's / operator for joining paths
-    if not main_py.exists():
-        with open(main_py, 'w') as f:
-            f.write(f'''"""{project_name} - A new Python project"""
-
-def main():
-    print("Hello, World!")
-
-
-if __name__ == "__main__":
-    main()
-''')
+    # Write each file that doesn't exist yet. The main Python file has the
+    # same name as the project, following Python naming conventions for the
+    # main module.
+    files = {
+        f"{project_name}.py": MAIN_TEMPLATE.format(project_name=project_name),
+        "README.md": README_TEMPLATE.format(project_name=project_name, **VENV_COMMANDS[venv_tool]),
+        "requirements.txt": REQUIREMENTS_TEMPLATE,
+    }
+    for filename, contents in files.items():
+        path = project_dir / filename  # Uses pathlib's / operator for joining paths
+        if not path.exists():
+            path.write_text(contents, encoding='utf-8')
     
-    # Create README.md with basic project documentation
-    # This includes setup instructions and usage examples
-    readme = project_dir / "README.md"
-    if not readme.exists():
-        with open(readme, 'w') as f:
-            f.write(f"# {project_name}\n\n"
-                    "## Description\n"
-                    "A new Python project.\n\n"
-                    "## Setup\n"
-                    "1. Create a virtual environment\n"
-                    "   ```powershell\n"
-                    f"   cd {project_name}\\n   python -m venv venv\n   .\\venv\\Scripts\\activate\n   pip install -r requirements.txt\n   ```\n"
-                    "\n## Usage\n"
-                    f"Run `python {project_name}.py`")
+    return project_dir
+
+def get_venv_tool(project_dir):
+    """
+    Returns the tool the project's virtual environment is (or will be) made
+    with: "uv" or "venv".
     
-    # Create requirements.txt for managing Python dependencies
-    # This file will be used by pip to install required packages
-    requirements = project_dir / "requirements.txt"
-    if not requirements.exists():
-        with open(requirements, 'w') as f:
-            f.write("# Add your project dependencies here\n"
-                    "# Example:\n"
-                    "# requests==2.31.0\n"
-                    "# numpy>=1.21.0\n")
+    An existing environment is checked for the uv entry that uv writes to
+    pyvenv.cfg. A new one is made with uv when it is installed, since uv
+    creates it in a fraction of the time venv takes by linking the
+    interpreter instead of copying it and skipping the pip bootstrap.
     
-    return project_dir
+    Args:
+        project_dir (Path): Path object pointing to the project directory
+    """
+    venv_dir = project_dir / "venv"
+    if venv_dir.exists():
+        try:
+            config = (venv_dir / "pyvenv.cfg").read_text(encoding='utf-8')
+        except OSError:
+            return "venv"
+        made_by_uv = any(line.split("=")[0].strip() == "uv" for line in config.splitlines())
+        return "uv" if made_by_uv else "venv"
+    return "uv" if shutil.which("uv") else "venv"
 
-def setup_virtualenv(project_dir):
+def setup_virtualenv(project_dir, venv_tool="venv"):
     """
     Sets up a Python virtual environment in the specified directory.
     
     Args:
         project_dir (Path): Path object pointing to the project directory
+        venv_tool (str): "venv" or "uv", the tool to create the environment with
     """
     venv_dir = project_dir / "venv"
     if not venv_dir.exists():
         print(f"Creating virtual environment in {venv_dir}...")
-        subprocess.run(["python", "-m", "venv", str(venv_dir)], check=True)
+        # Both tools build the environment on the running interpreter
+        if venv_tool == "uv":
+            subprocess.run(["uv", "venv", "--python", sys.executable, str(venv_dir)], check=True)
+        else:
+            subprocess.run([sys.executable, "-m", "venv", str(venv_dir)], check=True)
 
         # Determine the correct paths based on the operating system
         # Windows uses Scripts/activate and python.exe
@@ -129,12 +170,15 @@ def main():
     
     print(f"Creating new Python project: {args.project_name}")
     
+    # Pick the environment tool first so the README's setup steps match it
+    venv_tool = "venv" if args.no_venv else get_venv_tool(Path(args.project_name))
+    
     # Create the basic project structure
-    project_dir = create_project_structure(args.project_name)
+    project_dir = create_project_structure(args.project_name, venv_tool)
     
     # Set up virtual environment unless --no-venv flag is used
     if not args.no_venv:
-        setup_virtualenv(project_dir)
+        setup_virtualenv(project_dir, venv_tool)
     
     # Print success message with project location
     print("\nProject structure created successfully!")
@@ -147,7 +191,7 @@ def main():
         print("2. .\\venv\\Scripts\\activate  # On Windows")
         print("   # or")
         print("   # source venv/bin/activate  # On Unix/MacOS")
-        print("3. pip install -r requirements.txt")
+        print(f"3. {VENV_COMMANDS[venv_tool]['pip']} install -r requirements.txt")
 
 if __name__ == "__main__":
     # This ensures that main() is only called when the script is run directly,